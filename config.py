@@ -26,6 +26,9 @@ MAX_GAMMA_VALUE = 3.0
 ENABLE_CACHE = False  # 是否启用缓存
 CACHE_SIZE = 100      # 缓存大小
 CACHE_TTL = 3600      # 缓存过期时间（秒）
+DECODE_CACHE_SIZE = 32  # 解码缓存最大图片数
+DECODE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 单张图片超过该像素字节数时不缓存
+DECODE_CACHE_TOTAL_BYTES = 256 * 1024 * 1024  # 解码缓存的像素字节总数上限，超出时淘汰最久未用的图片
 
 # 日志配置
 LOG_LEVEL = "INFO"
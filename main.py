@@ -58,7 +58,9 @@ from tools.color_adjust import (
     adjust_sharpness as color_adjust_sharpness,
     convert_to_grayscale as color_convert_to_grayscale,
     adjust_gamma as color_adjust_gamma,
-    adjust_opacity as color_adjust_opacity
+    adjust_opacity as color_adjust_opacity,
+    adjust_multi as color_adjust_multi,
+    adjust_tone as color_adjust_tone
 )
 
 # Effects tools
@@ -106,11 +108,12 @@ mcp = FastMCP("PS-MCP")
 
 @mcp.tool()
 def load_image(
-    source: Annotated[str, Field(description="图片文件路径或base64编码的图片数据。支持本地文件路径（如 'image.jpg'）或base64编码字符串")]
+    source: Annotated[str, Field(description="图片文件路径或base64编码的图片数据。支持本地文件路径（如 'image.jpg'）或base64编码字符串")],
+    include_data: Annotated[bool, Field(description="是否输出图片文件引用，为false时只返回图片信息", default=True)]
 ) -> str:
     """加载图片文件或base64编码的图片"""
     try:
-        result = safe_run_async(basic_load_image(source))
+        result = safe_run_async(basic_load_image(source, include_data))
         return result[0].text
     except Exception as e:
         return json.dumps({
@@ -485,6 +488,38 @@ def adjust_opacity(
             "error": f"调整不透明度失败: {str(e)}"
         }, ensure_ascii=False, indent=2)
 
+@mcp.tool()
+def adjust_multi(
+    image_source: Annotated[str, Field(description="图片源，可以是文件路径或base64编码的图片数据")],
+    operations: Annotated[list, Field(description="调整操作列表，按顺序应用，每项如 {\"type\": \"brightness\", \"factor\": 1.2}；type 支持 brightness、contrast、saturation（因子 0.0-2.0）和 gamma（0.1-3.0）")]
+) -> str:
+    """一次性应用多项色彩调整"""
+    try:
+        result = safe_run_async(color_adjust_multi(image_source, operations))
+        return result[0].text
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": f"组合调整失败: {str(e)}"
+        }, ensure_ascii=False, indent=2)
+
+@mcp.tool()
+def adjust_tone(
+    image_source: Annotated[str, Field(description="图片源，可以是文件路径或base64编码的图片数据")],
+    brightness: Annotated[float, Field(description="亮度调整因子，范围 0.0-2.0，1.0为原始亮度", ge=0.0, le=2.0, default=1.0)],
+    contrast: Annotated[float, Field(description="对比度调整因子，范围 0.0-2.0，以128为中心，1.0为原始对比度", ge=0.0, le=2.0, default=1.0)],
+    gamma: Annotated[float, Field(description="伽马值，范围 0.1-3.0，1.0为原始值", ge=0.1, le=3.0, default=1.0)]
+) -> str:
+    """通过组合查找表同时调整伽马、对比度和亮度"""
+    try:
+        result = safe_run_async(color_adjust_tone(image_source, brightness, contrast, gamma))
+        return result[0].text
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": f"色调调整失败: {str(e)}"
+        }, ensure_ascii=False, indent=2)
+
 # ============ 特效工具 ============
 
 @mcp.tool()
@@ -492,9 +527,9 @@ def add_border(
     image_source: Annotated[str, Field(description="图片源，可以是文件路径或base64编码的图片数据")],
     border_width: Annotated[int, Field(description="边框宽度（像素）", ge=1, default=10)],
     border_color: Annotated[str, Field(description="边框颜色，十六进制格式如 #000000（黑色）", default="#000000")],
-    border_style: Annotated[str, Field(description="边框样式：solid（实线）、dashed（虚线）、dotted（点线）", default="solid")],
+    border_style: Annotated[str, Field(description="边框样式：solid（实线）、rounded（圆角）、shadow（阴影）", default="solid")],
     corner_radius: Annotated[int, Field(description="圆角半径（像素），0为直角", ge=0, default=10)],
-    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP 等", default="PNG")]
+    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP（不区分大小写）", default="PNG")]
 ) -> str:
     """为图片添加边框效果"""
     try:
@@ -520,7 +555,7 @@ def create_silhouette(
     silhouette_color: Annotated[str, Field(description="剪影颜色，十六进制格式如 #000000（黑色）", default="#000000")],
     background_color: Annotated[str, Field(description="背景颜色，十六进制格式或 'transparent'（透明）", default="transparent")],
     threshold: Annotated[int, Field(description="阈值，范围 0-255，用于确定剪影边界", ge=0, le=255, default=128)],
-    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP 等", default="PNG")]
+    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP（不区分大小写）", default="PNG")]
 ) -> str:
     """创建图片的剪影效果"""
     try:
@@ -547,7 +582,7 @@ def add_shadow(
     shadow_offset_y: Annotated[int, Field(description="阴影垂直偏移（像素），正值向下，负值向上", default=5)],
     shadow_blur: Annotated[int, Field(description="阴影模糊半径（像素）", ge=0, default=5)],
     shadow_opacity: Annotated[float, Field(description="阴影不透明度，范围 0.0-1.0", ge=0.0, le=1.0, default=0.5)],
-    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP 等", default="PNG")]
+    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP（不区分大小写）", default="PNG")]
 ) -> str:
     """为图片添加阴影效果"""
     try:
@@ -576,7 +611,7 @@ def add_watermark(
     position: Annotated[str, Field(description="水印位置：top-left、top-right、bottom-left、bottom-right、center", default="bottom-right")],
     opacity: Annotated[float, Field(description="水印不透明度，范围 0.0-1.0", ge=0.0, le=1.0, default=0.5)],
     scale: Annotated[float, Field(description="水印缩放比例，1.0为原始大小", gt=0, default=1.0)],
-    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP 等", default="PNG")]
+    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP（不区分大小写）", default="PNG")]
 ) -> str:
     """为图片添加水印"""
     try:
@@ -604,7 +639,7 @@ def add_watermark(
 def apply_vignette(
     image_source: Annotated[str, Field(description="图片源，可以是文件路径或base64编码的图片数据")],
     strength: Annotated[float, Field(description="晕影强度，范围 0.0-1.0，值越大效果越明显", ge=0.0, le=1.0, default=0.5)],
-    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP 等", default="PNG")]
+    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP（不区分大小写）", default="PNG")]
 ) -> str:
     """应用晕影效果"""
     try:
@@ -626,7 +661,7 @@ def create_polaroid(
     image_source: Annotated[str, Field(description="图片源，可以是文件路径或base64编码的图片数据")],
     border_width: Annotated[int, Field(description="宝丽来边框宽度（像素）", ge=1, default=20)],
     shadow: Annotated[bool, Field(description="是否添加阴影效果", default=True)],
-    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP 等", default="PNG")]
+    output_format: Annotated[str, Field(description="输出格式：PNG、JPEG、WEBP（不区分大小写）", default="PNG")]
 ) -> str:
     """创建宝丽来风格效果"""
     try:
@@ -18,6 +18,7 @@ from tools.effects import (
     add_border, create_silhouette, add_shadow, 
     add_watermark, apply_vignette, create_polaroid
 )
+from tools.color_adjust import adjust_multi, adjust_tone
 from tools.advanced import (
     batch_resize, create_collage, create_thumbnail_grid,
     blend_images, extract_colors, create_gif
@@ -134,6 +135,25 @@ class TestEffects(unittest.TestCase):
         
         asyncio.run(run_test())
     
+    def test_apply_vignette_darkens_edges(self):
+        """测试暗角只压暗边缘，中心保持原色"""
+        async def run_test():
+            arguments = {
+                "image_source": self.test_image_base64,
+                "intensity": 1.0,
+                "radius": 0.5,
+                "color": "#000000"
+            }
+            result = await apply_vignette(arguments)
+            result_data = json.loads(result[0].text)
+            self.assertTrue(result_data["success"])
+
+            with Image.open(result_data["data"]["file_path"]) as vignetted:
+                self.assertEqual(vignetted.getpixel((100, 100)), (255, 0, 0, 255))
+                self.assertEqual(vignetted.getpixel((0, 0)), (0, 0, 0, 255))
+
+        asyncio.run(run_test())
+
     def test_create_polaroid(self):
         """测试创建宝丽来效果"""
         async def run_test():
@@ -153,6 +173,50 @@ class TestEffects(unittest.TestCase):
         
         asyncio.run(run_test())
 
+    def _assert_effect_succeeds(self, effect, **kwargs):
+        """以服务器接口允许的参数调用特效，断言处理成功"""
+        arguments = {"image_source": self.test_image_base64, **kwargs}
+        result = asyncio.run(effect(arguments))
+        result_data = json.loads(result[0].text)
+        self.assertTrue(result_data["success"], result_data.get("error"))
+
+    def test_add_border_accepts_wide_border(self):
+        """测试边框宽度不受100像素上限限制"""
+        self._assert_effect_succeeds(add_border, border_width=150)
+
+    def test_output_format_is_case_insensitive(self):
+        """测试小写输出格式可以通过校验"""
+        self._assert_effect_succeeds(add_border, output_format="png")
+        self._assert_effect_succeeds(create_silhouette, output_format="jpeg")
+
+    def test_add_shadow_accepts_large_blur_and_offset(self):
+        """测试阴影模糊半径和偏移不受旧上限限制"""
+        self._assert_effect_succeeds(add_shadow, shadow_blur=30)
+        self._assert_effect_succeeds(add_shadow, shadow_offset_x=80, shadow_offset_y=-80)
+
+    def test_add_watermark_accepts_large_scale(self):
+        """测试水印缩放比例可以大于2.0"""
+        self._assert_effect_succeeds(add_watermark, watermark_image=self.watermark_base64, scale=3.0)
+
+    def test_create_polaroid_accepts_narrow_border(self):
+        """测试宝丽来边框宽度可以小于10像素"""
+        self._assert_effect_succeeds(create_polaroid, border_width=5)
+
+    def test_effect_rejects_out_of_schema_values(self):
+        """测试超出schema范围或枚举的参数被拒绝"""
+        for effect, kwargs in (
+            (add_border, {"border_width": 0}),
+            (add_border, {"border_style": "dashed"}),
+            (add_shadow, {"shadow_opacity": 1.5}),
+            (add_watermark, {"watermark_text": "Hi", "scale": 0}),
+            (create_polaroid, {"output_format": "gif"}),
+        ):
+            with self.subTest(effect=effect.__name__, **kwargs):
+                arguments = {"image_source": self.test_image_base64, **kwargs}
+                result_data = json.loads(asyncio.run(effect(arguments))[0].text)
+                self.assertFalse(result_data["success"])
+                self.assertIn("参数验证失败", result_data["error"])
+
 class TestAdvanced(unittest.TestCase):
     """测试高级功能"""
     
@@ -237,7 +301,30 @@ class TestAdvanced(unittest.TestCase):
             self.assertTrue(result_data["success"])
         
         asyncio.run(run_test())
-    
+
+    def test_blend_images_modes(self):
+        """测试混合模式计算结果"""
+        async def run_test():
+            expected = {
+                "multiply": (0, 0, 0),
+                "screen": (255, 128, 0),
+            }
+            for blend_mode, color in expected.items():
+                arguments = {
+                    "image1_source": self.test_images[0],
+                    "image2_source": self.test_images[1],
+                    "blend_mode": blend_mode,
+                    "opacity": 1.0
+                }
+                result = await blend_images(arguments)
+                result_data = json.loads(result[0].text)
+                self.assertTrue(result_data["success"])
+
+                with Image.open(result_data["data"]["file_path"]) as blended:
+                    self.assertEqual(blended.convert("RGB").getpixel((50, 50)), color)
+
+        asyncio.run(run_test())
+
     def test_extract_colors(self):
         """测试提取颜色"""
         async def run_test():
@@ -274,6 +361,41 @@ class TestAdvanced(unittest.TestCase):
         
         asyncio.run(run_test())
 
+    def test_create_gif_mixed_frame_sizes(self):
+        """测试不同尺寸的帧统一尺寸后生成GIF，差分帧解码后还原各帧颜色"""
+        small = Image.new("RGB", (60, 80), "green")
+        buffer = io.BytesIO()
+        small.save(buffer, format="PNG")
+        sources = [
+            self.test_images[0],
+            f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}",
+            self.test_images[2]
+        ]
+        expected = [(255, 0, 0), (0, 128, 0), (0, 0, 255)]
+
+        async def run_test():
+            for resize_to in (None, {}, {"width": 64}):
+                for diff_optimize in (True, False):
+                    arguments = {
+                        "image_sources": sources,
+                        "duration": 200,
+                        "diff_optimize": diff_optimize
+                    }
+                    if resize_to is not None:
+                        arguments["resize_to"] = resize_to
+                    with self.subTest(resize_to=resize_to, diff_optimize=diff_optimize):
+                        result_data = json.loads((await create_gif(arguments))[0].text)
+                        self.assertTrue(result_data["success"], result_data.get("error"))
+                        self.assertEqual(result_data["data"]["size"], [100, 100])
+
+                        with Image.open(result_data["data"]["file_path"]) as gif:
+                            self.assertEqual(gif.n_frames, 3)
+                            for index, color in enumerate(expected):
+                                gif.seek(index)
+                                self.assertEqual(gif.convert("RGB").getpixel((50, 50)), color)
+
+        asyncio.run(run_test())
+
 class TestPerformance(unittest.TestCase):
     """测试性能优化功能"""
     
@@ -382,6 +504,125 @@ class TestPerformance(unittest.TestCase):
         new_stats = get_performance_stats()
         self.assertEqual(new_stats["monitor"]["total_operations"], 0)
 
+def _to_base64(image: Image.Image) -> str:
+    """将图片编码为PNG格式的base64数据"""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+class TestColorAdjust(unittest.TestCase):
+    """测试色彩调整功能"""
+    
+    def setUp(self):
+        """设置测试环境"""
+        # 纯色图片，各通道取奇数值以便检查中间结果是否被提前量化
+        self.test_image = Image.new("RGB", (20, 20), (201, 101, 51))
+        self.test_image_base64 = _to_base64(self.test_image)
+        
+        # 带透明度的各种模式：RGBA、LA、带透明色的调色板图
+        rgba = Image.new("RGBA", (20, 20), (201, 101, 51, 90))
+        la = Image.new("LA", (20, 20), (150, 60))
+        palette = Image.new("P", (20, 20), 1)
+        palette.putpalette([0, 0, 0, 201, 101, 51])
+        palette.paste(0, (0, 0, 10, 20))
+        palette.info["transparency"] = 0
+        self.alpha_images = {"RGBA": rgba, "LA": la, "P": palette}
+    
+    def _run_multi(self, image_source, operations):
+        """调用adjust_multi并返回解析后的结果"""
+        result = asyncio.run(adjust_multi(image_source, operations))
+        return json.loads(result[0].text)
+    
+    def test_adjust_multi_chains_operations(self):
+        """测试多项调整在同一缓冲区上依次应用，只在最后量化一次"""
+        result_data = self._run_multi(self.test_image_base64, [
+            {"type": "brightness", "factor": 0.5},
+            {"type": "brightness", "factor": 2.0}
+        ])
+        self.assertTrue(result_data["success"], result_data.get("error"))
+        
+        with Image.open(result_data["data"]["file_path"]) as adjusted:
+            self.assertEqual(adjusted.getpixel((5, 5)), (201, 101, 51))
+        
+        result_data = self._run_multi(self.test_image_base64, [
+            {"type": "saturation", "factor": 0.0},
+            {"type": "gamma", "factor": 1.0}
+        ])
+        self.assertTrue(result_data["success"], result_data.get("error"))
+        
+        with Image.open(result_data["data"]["file_path"]) as adjusted:
+            red, green, blue = adjusted.getpixel((5, 5))
+            self.assertEqual(red, green)
+            self.assertEqual(green, blue)
+    
+    def test_adjust_multi_rejects_invalid_operations(self):
+        """测试超出范围或不支持的调整操作被拒绝"""
+        for operations in (
+            [],
+            [{"type": "saturation", "factor": 3.0}],
+            [{"type": "gamma", "factor": 0.0}],
+            [{"type": "hue", "factor": 1.0}],
+            [{"type": "brightness", "factor": 1.2}, "contrast"]
+        ):
+            with self.subTest(operations=operations):
+                result_data = self._run_multi(self.test_image_base64, operations)
+                self.assertFalse(result_data["success"])
+                self.assertIn("参数验证失败", result_data["error"])
+    
+    def test_adjust_multi_preserves_alpha(self):
+        """测试带透明度的各种模式调整后保留alpha通道"""
+        operations = [{"type": "brightness", "factor": 0.5}]
+        expected_alpha = {"RGBA": (90, 90), "LA": (60, 60), "P": (0, 255)}
+        for mode, image in self.alpha_images.items():
+            with self.subTest(mode=mode):
+                result_data = self._run_multi(_to_base64(image), operations)
+                self.assertTrue(result_data["success"], result_data.get("error"))
+                
+                with Image.open(result_data["data"]["file_path"]) as adjusted:
+                    self.assertIn("A", adjusted.getbands())
+                    alpha = adjusted.getchannel("A")
+                    self.assertEqual((alpha.getpixel((0, 0)), alpha.getpixel((15, 0))), expected_alpha[mode])
+    
+    def _run_tone(self, image_source, **kwargs):
+        """调用adjust_tone并返回解析后的结果"""
+        result = asyncio.run(adjust_tone(image_source, **kwargs))
+        return json.loads(result[0].text)
+    
+    def test_adjust_tone_lookup_values(self):
+        """测试组合查找表在默认和非默认参数下的取值"""
+        gradient = Image.new("L", (256, 1))
+        gradient.putdata(list(range(256)))
+        gradient_base64 = _to_base64(gradient)
+        
+        # 默认参数下查找表为恒等映射
+        result_data = self._run_tone(gradient_base64)
+        self.assertTrue(result_data["success"], result_data.get("error"))
+        with Image.open(result_data["data"]["file_path"]) as toned:
+            self.assertEqual(list(toned.tobytes()), list(range(256)))
+        
+        # 先伽马、再以128为中心调整对比度、最后乘以亮度
+        result_data = self._run_tone(gradient_base64, brightness=0.5, contrast=2.0, gamma=2.0)
+        self.assertTrue(result_data["success"], result_data.get("error"))
+        with Image.open(result_data["data"]["file_path"]) as toned:
+            values = list(toned.tobytes())
+        for level in (0, 64, 128, 255):
+            gamma_value = (level / 255.0) ** 0.5 * 255
+            expected = min(255, max(0, round(((gamma_value - 128) * 2.0 + 128) * 0.5)))
+            self.assertEqual(values[level], expected)
+    
+    def test_adjust_tone_preserves_alpha(self):
+        """测试色调调整只改变颜色通道，alpha通道原样保留"""
+        expected_alpha = {"RGBA": (90, 90), "LA": (60, 60), "P": (0, 255)}
+        for mode, image in self.alpha_images.items():
+            with self.subTest(mode=mode):
+                result_data = self._run_tone(_to_base64(image), brightness=0.5)
+                self.assertTrue(result_data["success"], result_data.get("error"))
+                
+                with Image.open(result_data["data"]["file_path"]) as toned:
+                    self.assertIn("A", toned.getbands())
+                    alpha = toned.getchannel("A")
+                    self.assertEqual((alpha.getpixel((0, 0)), alpha.getpixel((15, 0))), expected_alpha[mode])
+
 class TestErrorHandling(unittest.TestCase):
     """测试错误处理"""
     
@@ -9,9 +9,11 @@ import asyncio
 import base64
 import json
 from io import BytesIO
+from unittest import mock
 from PIL import Image
 
 # 导入要测试的模块
+import utils.image_processor as image_processor_module
 from utils.image_processor import ImageProcessor
 from tools.basic import load_image, save_image, get_image_info, convert_format
 
@@ -40,6 +42,53 @@ class TestBasicOperations(unittest.TestCase):
         self.assertIsNotNone(image)
         self.assertEqual(image.size, (100, 100))
     
+    def test_image_loading_cached(self):
+        """测试解码缓存返回独立副本"""
+        processor = ImageProcessor()
+        first = processor.load_image_cached(self.test_image_base64)
+        first.thumbnail((10, 10))
+        
+        second = processor.load_image_cached(self.test_image_base64)
+        self.assertEqual(second.size, (100, 100))
+        self.assertEqual(second.format, 'PNG')
+        self.assertIsNot(first, second)
+    
+    def test_decode_cache_total_bytes_budget(self):
+        """测试解码缓存按像素字节总数淘汰最久未用的图片"""
+        sources = []
+        for color in ('red', 'green', 'blue'):
+            buffer = BytesIO()
+            Image.new('RGB', (100, 100), color=color).save(buffer, format='PNG')
+            sources.append(f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode('utf-8')}")
+        
+        # 每张图片30000字节，总预算只够缓存两张
+        with mock.patch.multiple(image_processor_module, ENABLE_CACHE=True,
+                                 DECODE_CACHE_TOTAL_BYTES=60000, _decode_cache_bytes=0), \
+                mock.patch.dict(image_processor_module._decode_cache, clear=True):
+            processor = ImageProcessor()
+            for source in sources:
+                processor.load_image_cached(source)
+            
+            cache = image_processor_module._decode_cache
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(image_processor_module._decode_cache_bytes, 60000)
+            self.assertEqual([image.getpixel((0, 0)) for image in cache.values()],
+                             [(0, 128, 0), (0, 0, 255)])
+    
+    def test_image_loading_exif_orientation(self):
+        """测试加载时按EXIF方向旋转图片"""
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = BytesIO()
+        Image.new('RGB', (40, 20), color='red').save(buffer, format='JPEG', exif=exif)
+        source = f"data:image/jpeg;base64,{base64.b64encode(buffer.getvalue()).decode('utf-8')}"
+        
+        processor = ImageProcessor()
+        image = processor.load_image(source)
+        self.assertEqual(image.size, (20, 40))
+        self.assertEqual(image.format, 'JPEG')
+        self.assertNotIn(0x0112, image.getexif())
+    
     def test_image_saving(self):
         """测试图片保存"""
         processor = ImageProcessor()
@@ -53,6 +53,7 @@
 
 import asyncio
 import json
+import re
 import sys
 import os
 from pathlib import Path
@@ -61,52 +62,64 @@ import traceback
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
-def process_test_result(result, test_name, test_number):
+# 快速嗅探结果状态与内嵌的base64图片数据，避免对大体积JSON做完整解析
+SUCCESS_PATTERN = re.compile(r'"success"\s*:\s*(true|false)')
+IMAGE_DATA_PATTERN = re.compile(r'"image_data"\s*:\s*"([^"]+)"')
+IMAGE_DATA_PLACEHOLDER = "✅ 图片处理成功 (Base64数据已生成)"
+
+def process_test_result(result, test_name, test_number, log_file=None):
     """
     处理测试结果，简化输出显示
     
+    完整结果以 NDJSON 格式逐行写入日志文件，终端只输出一行摘要；
+    仅在失败时输出格式化的完整结果。
+    
     Args:
         result: 测试结果
         test_name: 测试名称
         test_number: 测试编号
+        log_file: NDJSON 日志文件对象（可选）
     
     Returns:
         处理后的结果信息
     """
     if not result.content or len(result.content) == 0:
-        return "❌ 无返回内容"
+        return f"❌ 测试 {test_number:02d} {test_name}: 无返回内容"
+    
+    result_text = result.content[0].text
+    
+    # 快速路径：成功结果中的base64数据先替换为占位符，只解析剩余的小段JSON
+    parse_text = result_text
+    status = SUCCESS_PATTERN.search(result_text)
+    if status and status.group(1) == "true":
+        blob = IMAGE_DATA_PATTERN.search(result_text)
+        if blob:
+            parse_text = result_text[:blob.start(1)] + IMAGE_DATA_PLACEHOLDER + result_text[blob.end(1):]
     
     try:
-        result_text = result.content[0].text
-        result_data = json.loads(result_text)
-        
-        if result_data.get("success"):
-            data = result_data.get("data", {})
-            
-            # 如果有图片数据，只显示成功信息，不保存文件
-            if "image_data" in data:
-                clean_data = result_data.copy()
-                clean_data["data"]["image_data"] = "✅ 图片处理成功 (Base64数据已生成)"
-                return json.dumps(clean_data, ensure_ascii=False, indent=2)
-            
-            # 如果有文件路径信息
-            elif "file_path" in data:
-                clean_data = result_data.copy()
-                if "image_data" in data:
-                    clean_data["data"]["image_data"] = "✅ 图片处理成功 (Base64数据已生成)"
-                return json.dumps(clean_data, ensure_ascii=False, indent=2)
-            
-            # 没有图片数据的结果（如性能统计、图片信息等）
-            else:
-                return json.dumps(result_data, ensure_ascii=False, indent=2)
-        else:
-            return result_text
-            
+        try:
+            result_data = json.loads(parse_text)
+        except json.JSONDecodeError:
+            if parse_text is result_text:
+                raise
+            # 快速路径失配时回退到完整解析
+            result_data = json.loads(result_text)
     except json.JSONDecodeError:
         # 不是JSON格式，直接返回
-        return result_text
-    except Exception as e:
-        return f"处理结果时出错: {e}\n原始结果: {result_text}"
+        return f"❌ 测试 {test_number:02d} {test_name}: {result_text}"
+    
+    if log_file is not None:
+        record = {"test": test_number, "name": test_name, "result": result_data}
+        log_file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    
+    if not isinstance(result_data, dict) or not result_data.get("success"):
+        return f"❌ 测试 {test_number:02d} {test_name} 失败:\n" + json.dumps(result_data, ensure_ascii=False, indent=2)
+    
+    data = result_data.get("data")
+    file_path = data.get("file_path") if isinstance(data, dict) else None
+    if file_path:
+        return f"✅ 测试 {test_number:02d} {test_name} ok (saved: {file_path})"
+    return f"✅ 测试 {test_number:02d} {test_name} ok"
 
 def get_test_image_path():
     """获取测试图片路径"""
@@ -118,6 +131,55 @@ def get_test_image_path():
     
     return str(test_image_path)
 
+# 同时进行的工具调用上限
+MAX_CONCURRENT_CALLS = 5
+
+def build_test_specs(test_image):
+    """
+    构建测试用例列表
+    
+    Args:
+        test_image: 测试图片路径
+    
+    Returns:
+        (编号, 图标, 测试名称, 工具名称, 参数) 元组列表
+    """
+    return [
+        (1, "📋", "获取图片信息", "get_image_info", {"image_source": test_image}),
+        (2, "📏", "调整图片大小", "resize_image", {"image_source": test_image, "width": 200, "height": 200}),
+        (3, "🔄", "转换图片格式", "convert_format", {"image_source": test_image, "target_format": "JPEG"}),
+        (4, "🌫️", "应用模糊效果", "apply_blur", {"image_source": test_image, "radius": 2.0}),
+        (5, "✂️", "裁剪图片", "crop_image", {"image_source": test_image, "left": 125, "top": 25, "right": 1175, "bottom": 1275}),
+        (6, "🔄", "旋转图片", "rotate_image", {"image_source": test_image, "angle": 45}),
+        (7, "🔄", "翻转图片", "flip_image", {"image_source": test_image, "direction": "horizontal"}),
+        (8, "☀️", "调整亮度", "adjust_brightness", {"image_source": test_image, "factor": 1.3}),
+        (9, "🌓", "调整对比度", "adjust_contrast", {"image_source": test_image, "factor": 1.2}),
+        # (10, "⚫", "转换为灰度图", "convert_to_grayscale", {"image_source": test_image}),
+        (11, "🔍", "应用锐化滤镜", "apply_sharpen", {"image_source": test_image}),
+        (12, "🎨", "应用浮雕滤镜", "apply_emboss", {"image_source": test_image}),
+        (13, "📸", "应用复古棕褐色滤镜", "apply_sepia", {"image_source": test_image}),
+        (14, "🖼️", "添加边框", "add_border", {"image_source": test_image, "border_width": 10, "border_color": "#FF0000"}),
+        (15, "💧", "添加水印", "add_watermark", {"image_source": test_image, "watermark_text": "PS-MCP Test", "position": "bottom-right", "opacity": 0.7}),
+        (16, "🎨", "提取主要颜色", "extract_colors", {"image_source": test_image, "num_colors": 5}),
+        (17, "🖼️", "创建缩略图", "create_thumbnail_grid", {"image_sources": [test_image] * 4, "grid_size": "2x2", "thumbnail_size": 50}),
+        (18, "📊", "性能统计", "get_performance_stats", {}),
+        (19, "🔍", "应用边缘检测滤镜", "apply_find_edges", {"image_source": test_image}),
+        (20, "🌫️", "应用高斯模糊", "apply_gaussian_blur", {"image_source": test_image, "radius": 2.0}),
+        (21, "🌈", "调整饱和度", "adjust_saturation", {"image_source": test_image, "factor": 1.5}),
+        (22, "🔪", "调整锐度", "adjust_sharpness", {"image_source": test_image, "factor": 1.3}),
+        (23, "🔄", "应用反色滤镜", "apply_invert", {"image_source": test_image}),
+        (24, "👤", "创建剪影效果", "create_silhouette", {"image_source": test_image, "threshold": 128}),
+        (25, "🌑", "添加阴影效果", "add_shadow", {"image_source": test_image, "offset_x": 5, "offset_y": 5, "blur_radius": 3}),
+        (26, "🌅", "应用晕影效果", "apply_vignette", {"image_source": test_image, "strength": 0.5}),
+        (27, "📷", "创建宝丽来风格", "create_polaroid", {"image_source": test_image, "border_width": 20}),
+        (28, "⚡", "调整伽马值", "adjust_gamma", {"image_source": test_image, "gamma": 1.2}),
+        (29, "🔍", "调整不透明度", "adjust_opacity", {"image_source": test_image, "opacity": 0.7}),
+        (30, "📐", "应用轮廓滤镜", "apply_contour", {"image_source": test_image}),
+        (31, "🌊", "应用平滑滤镜", "apply_smooth", {"image_source": test_image}),
+        # 0表示无限循环
+        (32, "🎬", "创建GIF动画", "create_gif", {"image_sources": [test_image] * 3, "duration": 1000, "loop": 0}),
+    ]
+
 async def test_image_processing():
     """测试图片处理功能"""
     print("🧪 PS-MCP 图片处理功能测试 (使用 uv 虚拟环境)...")
@@ -157,324 +219,29 @@ async def test_image_processing():
                 tools = {tool.name: tool for tool in tools_result.tools}
                 print(f"✅ 发现 {len(tools)} 个工具: {list(tools.keys())}")
                 
-                # 测试1: 获取图片信息
-                print("\n📋 测试1: 获取图片信息...")
-                result = await session.call_tool("get_image_info", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "获取图片信息", 1)
-                print(f"✅ 测试 1: 获取图片信息")
-                print(f"结果: {processed_result}")
-                
-                # 测试2: 调整图片大小
-                print("\n📏 测试2: 调整图片大小...")
-                result = await session.call_tool("resize_image", {
-                    "image_source": test_image,
-                    "width": 200,
-                    "height": 200
-                })
-                processed_result = process_test_result(result, "调整图片大小", 2)
-                print(f"✅ 测试 2: 调整图片大小")
-                print(f"结果: {processed_result}")
-                
-                # 测试3: 转换图片格式
-                print("\n🔄 测试3: 转换图片格式...")
-                result = await session.call_tool("convert_format", {
-                    "image_source": test_image,
-                    "target_format": "JPEG"
-                })
-                processed_result = process_test_result(result, "转换图片格式", 3)
-                print(f"✅ 测试 3: 转换图片格式")
-                print(f"结果: {processed_result}")
-                
-                # 测试4: 应用模糊效果
-                print("\n🌫️ 测试4: 应用模糊效果...")
-                result = await session.call_tool("apply_blur", {
-                    "image_source": test_image,
-                    "radius": 2.0
-                })
-                processed_result = process_test_result(result, "应用模糊效果", 4)
-                print(f"✅ 测试 4: 应用模糊效果")
-                print(f"结果: {processed_result}")
-                    
-                # 测试5: 裁剪图片
-                print("\n✂️ 测试5: 裁剪图片...")
-                result = await session.call_tool("crop_image", {
-                    "image_source": test_image,
-                    "left": 125,
-                    "top": 25,
-                    "right": 1175,
-                    "bottom": 1275
-                })
-                processed_result = process_test_result(result, "裁剪图片", 5)
-                print(f"✅ 测试 5: 裁剪图片")
-                print(f"结果: {processed_result}")
-                
-                # 测试6: 旋转图片
-                print("\n🔄 测试6: 旋转图片...")
-                result = await session.call_tool("rotate_image", {
-                    "image_source": test_image,
-                    "angle": 45
-                })
-                processed_result = process_test_result(result, "旋转图片", 6)
-                print(f"✅ 测试 6: 旋转图片")
-                print(f"结果: {processed_result}")
-                
-                # 测试7: 翻转图片
-                print("\n🔄 测试7: 翻转图片...")
-                result = await session.call_tool("flip_image", {
-                    "image_source": test_image,
-                    "direction": "horizontal"
-                })
-                processed_result = process_test_result(result, "翻转图片", 7)
-                print(f"✅ 测试 7: 翻转图片")
-                print(f"结果: {processed_result}")
-                
-                # 测试8: 调整亮度
-                print("\n☀️ 测试8: 调整亮度...")
-                result = await session.call_tool("adjust_brightness", {
-                    "image_source": test_image,
-                    "factor": 1.3
-                })
-                processed_result = process_test_result(result, "调整亮度", 8)
-                print(f"✅ 测试 8: 调整亮度")
-                print(f"结果: {processed_result}")
-                
-                # 测试9: 调整对比度
-                print("\n🌓 测试9: 调整对比度...")
-                result = await session.call_tool("adjust_contrast", {
-                    "image_source": test_image,
-                    "factor": 1.2
-                })
-                processed_result = process_test_result(result, "调整对比度", 9)
-                print(f"✅ 测试 9: 调整对比度")
-                print(f"结果: {processed_result}")
-                
-                # 测试10: 转换为灰度图
-                # print("\n⚫ 测试10: 转换为灰度图...")
-                # result = await session.call_tool("convert_to_grayscale", {
-                #     "image_source": test_image
-                # })
-                # processed_result = process_test_result(result, "转换为灰度图", 10)
-                # print(f"✅ 测试 10: 转换为灰度图")
-                # print(f"结果: {processed_result}")
-                
-                # 测试11: 应用锐化滤镜
-                print("\n🔍 测试11: 应用锐化滤镜...")
-                result = await session.call_tool("apply_sharpen", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用锐化滤镜", 11)
-                print(f"✅ 测试 11: 应用锐化滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试12: 应用浮雕滤镜
-                print("\n🎨 测试12: 应用浮雕滤镜...")
-                result = await session.call_tool("apply_emboss", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用浮雕滤镜", 12)
-                print(f"✅ 测试 12: 应用浮雕滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试13: 应用复古棕褐色滤镜
-                print("\n📸 测试13: 应用复古棕褐色滤镜...")
-                result = await session.call_tool("apply_sepia", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用复古棕褐色滤镜", 13)
-                print(f"✅ 测试 13: 应用复古棕褐色滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试14: 添加边框
-                print("\n🖼️ 测试14: 添加边框...")
-                result = await session.call_tool("add_border", {
-                    "image_source": test_image,
-                    "border_width": 10,
-                    "border_color": "#FF0000"
-                })
-                processed_result = process_test_result(result, "添加边框", 14)
-                print(f"✅ 测试 14: 添加边框")
-                print(f"结果: {processed_result}")
-                
-                # 测试15: 添加水印
-                print("\n💧 测试15: 添加水印...")
-                result = await session.call_tool("add_watermark", {
-                    "image_source": test_image,
-                    "watermark_text": "PS-MCP Test",
-                    "position": "bottom-right",
-                    "opacity": 0.7
-                })
-                processed_result = process_test_result(result, "添加水印", 15)
-                print(f"✅ 测试 15: 添加水印")
-                print(f"结果: {processed_result}")
-                
-                # 测试16: 提取主要颜色
-                print("\n🎨 测试16: 提取主要颜色...")
-                result = await session.call_tool("extract_colors", {
-                    "image_source": test_image,
-                    "num_colors": 5
-                })
-                processed_result = process_test_result(result, "提取主要颜色", 16)
-                print(f"✅ 测试 16: 提取主要颜色")
-                print(f"结果: {processed_result}")
-                
-                # 测试17: 创建缩略图
-                print("\n🖼️ 测试17: 创建缩略图...")
-                result = await session.call_tool("create_thumbnail_grid", {
-                    "image_sources": [test_image, test_image, test_image, test_image],
-                    "grid_size": "2x2",
-                    "thumbnail_size": 50
-                })
-                processed_result = process_test_result(result, "创建缩略图", 17)
-                print(f"✅ 测试 17: 创建缩略图")
-                print(f"结果: {processed_result}")
-                
-                # 测试18: 性能统计
-                print("\n📊 测试18: 性能统计...")
-                result = await session.call_tool("get_performance_stats", {})
-                processed_result = process_test_result(result, "性能统计", 18)
-                print(f"✅ 测试 18: 性能统计")
-                print(f"结果: {processed_result}")
-                
-                # 测试19: 应用边缘检测滤镜
-                print("\n🔍 测试19: 应用边缘检测滤镜...")
-                result = await session.call_tool("apply_find_edges", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用边缘检测滤镜", 19)
-                print(f"✅ 测试 19: 应用边缘检测滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试20: 应用高斯模糊
-                print("\n🌫️ 测试20: 应用高斯模糊...")
-                result = await session.call_tool("apply_gaussian_blur", {
-                    "image_source": test_image,
-                    "radius": 2.0
-                })
-                processed_result = process_test_result(result, "应用高斯模糊", 20)
-                print(f"✅ 测试 20: 应用高斯模糊")
-                print(f"结果: {processed_result}")
-                
-                # 测试21: 调整饱和度
-                print("\n🌈 测试21: 调整饱和度...")
-                result = await session.call_tool("adjust_saturation", {
-                    "image_source": test_image,
-                    "factor": 1.5
-                })
-                processed_result = process_test_result(result, "调整饱和度", 21)
-                print(f"✅ 测试 21: 调整饱和度")
-                print(f"结果: {processed_result}")
-                
-                # 测试22: 调整锐度
-                print("\n🔪 测试22: 调整锐度...")
-                result = await session.call_tool("adjust_sharpness", {
-                    "image_source": test_image,
-                    "factor": 1.3
-                })
-                processed_result = process_test_result(result, "调整锐度", 22)
-                print(f"✅ 测试 22: 调整锐度")
-                print(f"结果: {processed_result}")
-                
-                # 测试23: 应用反色滤镜
-                print("\n🔄 测试23: 应用反色滤镜...")
-                result = await session.call_tool("apply_invert", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用反色滤镜", 23)
-                print(f"✅ 测试 23: 应用反色滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试24: 创建剪影效果
-                print("\n👤 测试24: 创建剪影效果...")
-                result = await session.call_tool("create_silhouette", {
-                    "image_source": test_image,
-                    "threshold": 128
-                })
-                processed_result = process_test_result(result, "创建剪影效果", 24)
-                print(f"✅ 测试 24: 创建剪影效果")
-                print(f"结果: {processed_result}")
-                
-                # 测试25: 添加阴影效果
-                print("\n🌑 测试25: 添加阴影效果...")
-                result = await session.call_tool("add_shadow", {
-                    "image_source": test_image,
-                    "offset_x": 5,
-                    "offset_y": 5,
-                    "blur_radius": 3
-                })
-                processed_result = process_test_result(result, "添加阴影效果", 25)
-                print(f"✅ 测试 25: 添加阴影效果")
-                print(f"结果: {processed_result}")
-                
-                # 测试26: 应用晕影效果
-                print("\n🌅 测试26: 应用晕影效果...")
-                result = await session.call_tool("apply_vignette", {
-                    "image_source": test_image,
-                    "strength": 0.5
-                })
-                processed_result = process_test_result(result, "应用晕影效果", 26)
-                print(f"✅ 测试 26: 应用晕影效果")
-                print(f"结果: {processed_result}")
-                
-                # 测试27: 创建宝丽来风格
-                print("\n📷 测试27: 创建宝丽来风格...")
-                result = await session.call_tool("create_polaroid", {
-                    "image_source": test_image,
-                    "border_width": 20
-                })
-                processed_result = process_test_result(result, "创建宝丽来风格", 27)
-                print(f"✅ 测试 27: 创建宝丽来风格")
-                # print(f"结果: {processed_result}")
-                
-                # 测试28: 调整伽马值
-                print("\n⚡ 测试28: 调整伽马值...")
-                result = await session.call_tool("adjust_gamma", {
-                    "image_source": test_image,
-                    "gamma": 1.2
-                })
-                processed_result = process_test_result(result, "调整伽马值", 28)
-                print(f"✅ 测试 28: 调整伽马值")
-                print(f"结果: {processed_result}")
-                
-                # 测试29: 调整不透明度
-                print("\n🔍 测试29: 调整不透明度...")
-                result = await session.call_tool("adjust_opacity", {
-                    "image_source": test_image,
-                    "opacity": 0.7
-                })
-                processed_result = process_test_result(result, "调整不透明度", 29)
-                print(f"✅ 测试 29: 调整不透明度")
-                print(f"结果: {processed_result}")
-                
-                # 测试30: 应用轮廓滤镜
-                print("\n📐 测试30: 应用轮廓滤镜...")
-                result = await session.call_tool("apply_contour", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用轮廓滤镜", 30)
-                print(f"✅ 测试 30: 应用轮廓滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试31: 应用平滑滤镜
-                print("\n🌊 测试31: 应用平滑滤镜...")
-                result = await session.call_tool("apply_smooth", {
-                    "image_source": test_image
-                })
-                processed_result = process_test_result(result, "应用平滑滤镜", 31)
-                print(f"✅ 测试 31: 应用平滑滤镜")
-                print(f"结果: {processed_result}")
-                
-                # 测试32: 创建GIF动画
-                print("\n🎬 测试32: 创建GIF动画...")
-                result = await session.call_tool("create_gif", {
-                    "image_sources": [test_image, test_image, test_image],
-                    "duration": 1000,
-                    "loop": 0  # 0表示无限循环
-                })
-                processed_result = process_test_result(result, "创建GIF动画", 32)
-                print(f"✅ 测试 32: 创建GIF动画")
-                print(f"结果: {processed_result}")
+                # 并发执行所有测试用例，最多同时运行 MAX_CONCURRENT_CALLS 个工具调用
+                sem = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+                
+                async def guarded(tool_name, arguments):
+                    async with sem:
+                        return await session.call_tool(tool_name, arguments)
+                
+                specs = build_test_specs(test_image)
+                results = await asyncio.gather(
+                    *(guarded(tool_name, arguments) for _, _, _, tool_name, arguments in specs),
+                    return_exceptions=True
+                )
+                
+                # 按编号顺序输出结果，完整结果写入 NDJSON 日志
+                log_path = current_dir / "output" / "test_results.ndjson"
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                print(f"📝 完整结果写入: {log_path}")
+                with open(log_path, "w", encoding="utf-8") as log_file:
+                    for (number, icon, test_name, _, _), result in zip(specs, results):
+                        if isinstance(result, Exception):
+                            print(f"❌ 测试 {number:02d} {test_name} 调用失败: {result}")
+                            continue
+                        print(f"{icon} " + process_test_result(result, test_name, number, log_file))
                 
                 print("\n🎉 所有图片处理功能测试完成!")
                 
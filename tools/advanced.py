@@ -5,11 +5,12 @@
 """
 
 from typing import List, Dict, Any, Tuple, Optional
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
-import json
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageEnhance
+import numpy as np
 import asyncio
+import math
 import os
-from concurrent.futures import ThreadPoolExecutor
+import struct
 import time
 
 from mcp.types import Tool, TextContent
@@ -19,11 +20,53 @@ from utils.validation import (
     validate_image_source, validate_numeric_range, validate_color_hex,
     ensure_valid_image_source, ValidationError
 )
+from utils.performance import run_in_thread_pool
+from utils.serialization import dumps_json
 from config import (
     MAX_IMAGE_SIZE, MIN_IMAGE_SIZE, MIN_DIMENSION, MAX_BLUR_RADIUS,
-    DEFAULT_FORMAT, DEFAULT_QUALITY, DEFAULT_IMAGE_FORMAT
+    MAX_COLLAGE_SIZE, DEFAULT_FORMAT, DEFAULT_QUALITY, DEFAULT_IMAGE_FORMAT
 )
 
+# 全局图片处理器实例
+processor = ImageProcessor()
+
+# 重采样方法映射
+_RESAMPLE_MAP = {
+    "LANCZOS": Image.Resampling.LANCZOS,
+    "BILINEAR": Image.Resampling.BILINEAR,
+    "BICUBIC": Image.Resampling.BICUBIC,
+    "NEAREST": Image.Resampling.NEAREST
+}
+
+# 颜色量化方法映射
+_QUANTIZE_MAP = {
+    "FASTOCTREE": Image.Quantize.FASTOCTREE,
+    "MEDIANCUT": Image.Quantize.MEDIANCUT,
+    "MAXCOVERAGE": Image.Quantize.MAXCOVERAGE
+}
+
+# 提取主要颜色时的采样尺寸（主色调分布与分辨率无关）
+_COLOR_SAMPLE_SIZE = 256
+
+def _error_response(prefix: str, error: Exception) -> List[TextContent]:
+    """
+    构建统一的失败响应
+    
+    Args:
+        prefix: 错误信息前缀
+        error: 捕获的异常
+        
+    Returns:
+        List[TextContent]: 失败响应
+    """
+    return [TextContent(
+        type="text",
+        text=dumps_json({
+            "success": False,
+            "error": f"{prefix}: {error}"
+        })
+    )]
+
 def get_advanced_tools() -> List[Tool]:
     """
     返回高级功能工具列表
@@ -113,14 +156,14 @@ def get_advanced_tools() -> List[Tool]:
                         "type": "integer",
                         "description": "最大宽度",
                         "minimum": 200,
-                        "maximum": MAX_IMAGE_SIZE,
+                        "maximum": MAX_COLLAGE_SIZE,
                         "default": 1200
                     },
                     "max_height": {
                         "type": "integer",
                         "description": "最大高度",
                         "minimum": 200,
-                        "maximum": MAX_IMAGE_SIZE,
+                        "maximum": MAX_COLLAGE_SIZE,
                         "default": 1200
                     },
                     "output_format": {
@@ -254,6 +297,12 @@ def get_advanced_tools() -> List[Tool]:
                         "maximum": 20,
                         "default": 5
                     },
+                    "quantize_method": {
+                        "type": "string",
+                        "description": "颜色量化方法（FASTOCTREE速度快，MEDIANCUT质量更稳定）",
+                        "enum": ["FASTOCTREE", "MEDIANCUT", "MAXCOVERAGE"],
+                        "default": "FASTOCTREE"
+                    },
                     "create_palette": {
                         "type": "boolean",
                         "description": "是否创建调色板图片",
@@ -314,6 +363,17 @@ def get_advanced_tools() -> List[Tool]:
                             "width": {"type": "integer", "minimum": 50, "maximum": 800},
                             "height": {"type": "integer", "minimum": 50, "maximum": 800}
                         }
+                    },
+                    "diff_optimize": {
+                        "type": "boolean",
+                        "description": "是否使用共享调色板并将帧间未变化的像素设为透明（显著减小文件大小）",
+                        "default": True
+                    },
+                    "resample_method": {
+                        "type": "string",
+                        "description": "帧缩放的重采样方法（GIF会重新量化为256色，默认BILINEAR即可）",
+                        "enum": ["LANCZOS", "BILINEAR", "BICUBIC", "NEAREST"],
+                        "default": "BILINEAR"
                     }
                 },
                 "required": ["image_sources"]
@@ -350,61 +410,51 @@ async def batch_resize(arguments: Dict[str, Any]) -> List[TextContent]:
         validate_numeric_range(height, MIN_IMAGE_SIZE, MAX_IMAGE_SIZE, "height")
         
         # 获取重采样方法
-        resample_map = {
-            "LANCZOS": Image.Resampling.LANCZOS,
-            "BILINEAR": Image.Resampling.BILINEAR,
-            "BICUBIC": Image.Resampling.BICUBIC,
-            "NEAREST": Image.Resampling.NEAREST
-        }
-        resample = resample_map.get(resample_method, Image.Resampling.LANCZOS)
-        
-        processor = ImageProcessor()
+        resample = _RESAMPLE_MAP.get(resample_method, Image.Resampling.LANCZOS)
+        
         results = []
         failed_count = 0
         
-        # 使用线程池进行并行处理
+        # 单张图片的同步处理逻辑，在共享线程池中执行
         def resize_single_image(image_source):
-            try:
-                ensure_valid_image_source(image_source)
-                image = processor.load_image(image_source)
-                
-                if maintain_aspect_ratio:
-                    # 保持宽高比
-                    image.thumbnail((width, height), resample)
-                    resized_image = image
-                else:
-                    # 强制调整到指定尺寸
-                    resized_image = image.resize((width, height), resample)
-                
-                # 输出图片
-                output_info = processor.output_image(resized_image, "batch_resize", output_format)
-                return output_info
-            except Exception as e:
-                return f"ERROR: {str(e)}"
+            # JPEG在解码阶段按DCT缩放到目标尺寸的2倍以上，再由重采样滤镜完成缩放
+            image = _load_source(processor, image_source, (width * 2, height * 2))
+            
+            if maintain_aspect_ratio:
+                # 保持宽高比
+                image.thumbnail((width, height), resample, reducing_gap=2.0)
+                resized_image = image
+            else:
+                # 强制调整到指定尺寸（尺寸已一致时直接使用原图）
+                resized_image = _resize_to(image, (width, height), resample)
+            
+            # 输出图片
+            return processor.output_image(resized_image, "batch_resize", output_format)
         
         # 并行处理
-        with ThreadPoolExecutor(max_workers=min(len(image_sources), MAX_CONCURRENT_TASKS)) as executor:
-            futures = [executor.submit(resize_single_image, source) for source in image_sources]
-            
-            for i, future in enumerate(futures):
-                result = future.result()
-                if result.startswith("ERROR:"):
-                    failed_count += 1
-                    results.append({
-                        "index": i,
-                        "success": False,
-                        "error": result[7:]  # 移除"ERROR: "前缀
-                    })
-                else:
-                    results.append({
-                        "index": i,
-                        "success": True,
-                        "result": result
-                    })
+        outcomes = await asyncio.gather(
+            *(run_in_thread_pool(resize_single_image, source) for source in image_sources),
+            return_exceptions=True
+        )
+        
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                failed_count += 1
+                results.append({
+                    "index": i,
+                    "success": False,
+                    "error": str(outcome)
+                })
+            else:
+                results.append({
+                    "index": i,
+                    "success": True,
+                    "result": outcome
+                })
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps_json({
                 "success": True,
                 "message": f"批量调整完成，成功: {len(results) - failed_count}, 失败: {failed_count}",
                 "results": results,
@@ -417,25 +467,13 @@ async def batch_resize(arguments: Dict[str, Any]) -> List[TextContent]:
                     "resample_method": resample_method,
                     "format": output_format
                 }
-            }, ensure_ascii=False)
+            })
         )]
         
     except ValidationError as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"参数验证失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("参数验证失败", e)
     except Exception as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"批量调整失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("批量调整失败", e)
 
 async def create_collage(arguments: Dict[str, Any]) -> List[TextContent]:
     """
@@ -463,107 +501,119 @@ async def create_collage(arguments: Dict[str, Any]) -> List[TextContent]:
         # 验证参数
         validate_numeric_range(spacing, 0, 50, "spacing")
         validate_color_hex(background_color)
-        validate_numeric_range(max_width, 200, MAX_IMAGE_SIZE, "max_width")
-        validate_numeric_range(max_height, 200, MAX_IMAGE_SIZE, "max_height")
+        # 画布尺寸上限使用MAX_COLLAGE_SIZE（像素），避免分配超大连续画布
+        if not validate_numeric_range(max_width, 200, MAX_COLLAGE_SIZE):
+            raise ValidationError(f"最大宽度必须在200-{MAX_COLLAGE_SIZE}范围内: {max_width}")
+        if not validate_numeric_range(max_height, 200, MAX_COLLAGE_SIZE):
+            raise ValidationError(f"最大高度必须在200-{MAX_COLLAGE_SIZE}范围内: {max_height}")
+        
+        # 背景色只解析一次，后续画布直接使用RGB元组填充
+        background_rgb = ImageColor.getrgb(background_color)[:3]
+        
+        grid_layout = layout not in ("horizontal", "vertical")
+        if grid_layout:
+            # 网格排列：单元格尺寸只取决于图片数量，加载时即可直接缩放到单元格
+            cols = math.ceil(math.sqrt(len(image_sources)))
+            rows = math.ceil(len(image_sources) / cols)
+            cell_width = (max_width - spacing * (cols - 1)) // cols
+            cell_height = (max_height - spacing * (rows - 1)) // rows
+            # 马赛克单元格较小，细节不可见，使用面积平均（BOX）代替LANCZOS
+            cell_resample = Image.Resampling.BOX if layout == "mosaic" else Image.Resampling.LANCZOS
+            
+            def _load(source):
+                image = _load_source(processor, source, (cell_width * 2, cell_height * 2))
+                return _fit_to_cell(image, cell_width, cell_height, cell_resample)
+        else:
+            def _load(source):
+                return _load_source(processor, source)
         
-        processor = ImageProcessor()
-        images = []
+        # 并行加载（网格布局同时完成缩放）所有图片
+        images = list(await asyncio.gather(
+            *(run_in_thread_pool(_load, source) for source in image_sources)
+        ))
         
-        # 加载所有图片
-        for source in image_sources:
-            ensure_valid_image_source(source)
-            image = processor.load_image(source)
-            images.append(image)
-        
-        # 根据布局创建拼贴
-        if layout == "horizontal":
-            # 水平排列
-            total_width = sum(img.width for img in images) + spacing * (len(images) - 1)
-            max_height_img = max(img.height for img in images)
+        def _build_collage():
+            """同步的拼贴处理逻辑，在共享线程池中执行"""
+            nonlocal images
             
-            # 缩放以适应最大尺寸
-            if total_width > max_width:
-                scale = max_width / total_width
-                images = [img.resize((int(img.width * scale), int(img.height * scale)), 
-                                   Image.Resampling.LANCZOS) for img in images]
-                total_width = max_width
+            # 根据布局创建拼贴
+            if layout == "horizontal":
+                # 水平排列
+                total_width = sum(img.width for img in images) + spacing * (len(images) - 1)
                 max_height_img = max(img.height for img in images)
             
-            collage = Image.new("RGB", (total_width, max_height_img), background_color)
-            x_offset = 0
+                # 缩放以适应最大尺寸
+                if total_width > max_width:
+                    scale = max_width / total_width
+                    images = [img.resize((int(img.width * scale), int(img.height * scale)), 
+                                       Image.Resampling.LANCZOS, reducing_gap=2.0) for img in images]
+                    total_width = max_width
+                    max_height_img = max(img.height for img in images)
             
-            for img in images:
-                y_offset = (max_height_img - img.height) // 2
-                collage.paste(img, (x_offset, y_offset))
-                x_offset += img.width + spacing
-                
-        elif layout == "vertical":
-            # 垂直排列
-            max_width_img = max(img.width for img in images)
-            total_height = sum(img.height for img in images) + spacing * (len(images) - 1)
+                collage = Image.new("RGB", (total_width, max_height_img), background_rgb)
+                x_offset = 0
             
-            # 缩放以适应最大尺寸
-            if total_height > max_height:
-                scale = max_height / total_height
-                images = [img.resize((int(img.width * scale), int(img.height * scale)), 
-                                   Image.Resampling.LANCZOS) for img in images]
-                max_width_img = max(img.width for img in images)
-                total_height = max_height
-            
-            collage = Image.new("RGB", (max_width_img, total_height), background_color)
-            y_offset = 0
-            
-            for img in images:
-                x_offset = (max_width_img - img.width) // 2
-                collage.paste(img, (x_offset, y_offset))
-                y_offset += img.height + spacing
+                for img in images:
+                    y_offset = (max_height_img - img.height) // 2
+                    collage.paste(img, (x_offset, y_offset))
+                    x_offset += img.width + spacing
                 
-        else:  # grid 或 mosaic
-            # 网格排列
-            import math
-            cols = math.ceil(math.sqrt(len(images)))
-            rows = math.ceil(len(images) / cols)
+            elif layout == "vertical":
+                # 垂直排列
+                max_width_img = max(img.width for img in images)
+                total_height = sum(img.height for img in images) + spacing * (len(images) - 1)
             
-            # 计算每个单元格的大小
-            cell_width = (max_width - spacing * (cols - 1)) // cols
-            cell_height = (max_height - spacing * (rows - 1)) // rows
+                # 缩放以适应最大尺寸
+                if total_height > max_height:
+                    scale = max_height / total_height
+                    images = [img.resize((int(img.width * scale), int(img.height * scale)), 
+                                       Image.Resampling.LANCZOS, reducing_gap=2.0) for img in images]
+                    max_width_img = max(img.width for img in images)
+                    total_height = max_height
             
-            # 调整所有图片到单元格大小
-            resized_images = []
-            for img in images:
-                img.thumbnail((cell_width, cell_height), Image.Resampling.LANCZOS)
-                resized_images.append(img)
+                collage = Image.new("RGB", (max_width_img, total_height), background_rgb)
+                y_offset = 0
             
-            # 创建拼贴
-            collage_width = cols * cell_width + spacing * (cols - 1)
-            collage_height = rows * cell_height + spacing * (rows - 1)
-            collage = Image.new("RGB", (collage_width, collage_height), background_color)
+                for img in images:
+                    x_offset = (max_width_img - img.width) // 2
+                    collage.paste(img, (x_offset, y_offset))
+                    y_offset += img.height + spacing
+                
+            else:  # grid 或 mosaic
+                # 网格排列，图片已在加载时缩放到单元格大小
+                collage_width = cols * cell_width + spacing * (cols - 1)
+                collage_height = rows * cell_height + spacing * (rows - 1)
+                collage = Image.new("RGB", (collage_width, collage_height), background_rgb)
             
-            for i, img in enumerate(resized_images):
-                row = i // cols
-                col = i % cols
+                for i, img in enumerate(images):
+                    row = i // cols
+                    col = i % cols
                 
-                x = col * (cell_width + spacing)
-                y = row * (cell_height + spacing)
+                    x = col * (cell_width + spacing)
+                    y = row * (cell_height + spacing)
                 
-                # 居中放置图片
-                x_offset = x + (cell_width - img.width) // 2
-                y_offset = y + (cell_height - img.height) // 2
+                    # 居中放置图片
+                    x_offset = x + (cell_width - img.width) // 2
+                    y_offset = y + (cell_height - img.height) // 2
                 
-                collage.paste(img, (x_offset, y_offset))
+                    collage.paste(img, (x_offset, y_offset))
+            
+            # 转换为base64
+            output_info = processor.output_image(collage, "batch_resize", output_format)
+            
+            return collage, output_info, len(images)
         
-        # 转换为base64
-        output_info = processor.output_image(collage, "batch_resize", output_format)
+        collage, output_info, image_count = await run_in_thread_pool(_build_collage)
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps_json({
                 "success": True,
                 "message": f"成功创建{layout}拼贴",
                 "data": {
                     **output_info,
                     "metadata": {
-                        "image_count": len(images),
+                        "image_count": image_count,
                         "layout": layout,
                         "size": f"{collage.width}x{collage.height}",
                         "spacing": spacing,
@@ -571,25 +621,13 @@ async def create_collage(arguments: Dict[str, Any]) -> List[TextContent]:
                         "format": output_format
                     }
                 }
-            }, ensure_ascii=False)
+            })
         )]
         
     except ValidationError as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"参数验证失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("参数验证失败", e)
     except Exception as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"创建拼贴失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("创建拼贴失败", e)
 
 async def create_thumbnail_grid(arguments: Dict[str, Any]) -> List[TextContent]:
     """
@@ -623,73 +661,91 @@ async def create_thumbnail_grid(arguments: Dict[str, Any]) -> List[TextContent]:
         validate_numeric_range(border_width, 0, 10, "border_width")
         validate_color_hex(border_color)
         
-        processor = ImageProcessor()
-        thumbnails = []
+        # 颜色只解析一次，避免每张缩略图重复解析颜色字符串
+        background_rgb = ImageColor.getrgb(background_color)[:3]
+        border_rgb = ImageColor.getrgb(border_color)[:3]
         
-        # 创建缩略图
-        for source in image_sources:
+        def _make_thumbnail(source):
+            """加载单张图片并缩放为缩略图，返回RGB像素数组（失败时返回None）"""
             try:
-                ensure_valid_image_source(source)
-                image = processor.load_image(source)
+                image = _load_source(processor, source)
                 
-                # 创建正方形缩略图
-                image.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
+                # 创建缩略图
+                image.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+                if image.mode != "RGB":
+                    image = image.convert("RGB")
                 
-                # 创建正方形背景
-                thumb = Image.new("RGB", (thumbnail_size, thumbnail_size), background_color)
+                return np.asarray(image)
                 
-                # 居中粘贴图片
-                x_offset = (thumbnail_size - image.width) // 2
-                y_offset = (thumbnail_size - image.height) // 2
-                thumb.paste(image, (x_offset, y_offset))
+            except Exception:
+                return None
+        
+        # 并行加载并缩放所有图片
+        thumbnails = await asyncio.gather(
+            *(run_in_thread_pool(_make_thumbnail, source) for source in image_sources)
+        )
+        
+        def _build_grid():
+            """同步的缩略图网格处理逻辑，在共享线程池中执行"""
+            # 计算网格尺寸
+            rows = (len(thumbnails) + columns - 1) // columns
+            grid_width = columns * thumbnail_size + spacing * (columns - 1)
+            grid_height = rows * thumbnail_size + spacing * (rows - 1)
+            
+            # 预分配整个网格并广播填充背景色，缩略图与边框直接按切片写入
+            grid = np.empty((grid_height, grid_width, 3), dtype=np.uint8)
+            grid[:] = background_rgb
+            error_cell = None
+            
+            for i, thumb in enumerate(thumbnails):
+                row = i // columns
+                col = i % columns
                 
-                # 添加边框
-                if border_width > 0:
-                    draw = ImageDraw.Draw(thumb)
-                    for i in range(border_width):
-                        draw.rectangle(
-                            [i, i, thumbnail_size - 1 - i, thumbnail_size - 1 - i],
-                            outline=border_color
-                        )
+                x = col * (thumbnail_size + spacing)
+                y = row * (thumbnail_size + spacing)
+                cell = grid[y:y + thumbnail_size, x:x + thumbnail_size]
                 
-                thumbnails.append(thumb)
+                if thumb is None:
+                    # 错误占位符只绘制一次
+                    if error_cell is None:
+                        error_thumb = Image.new("RGB", (thumbnail_size, thumbnail_size), (255, 0, 0))
+                        draw = ImageDraw.Draw(error_thumb)
+                        draw.text((10, thumbnail_size//2), "ERROR", fill="white")
+                        error_cell = np.asarray(error_thumb)
+                    cell[:] = error_cell
+                    continue
                 
-            except Exception as e:
-                # 创建错误占位符
-                error_thumb = Image.new("RGB", (thumbnail_size, thumbnail_size), "#FF0000")
-                draw = ImageDraw.Draw(error_thumb)
-                draw.text((10, thumbnail_size//2), "ERROR", fill="white")
-                thumbnails.append(error_thumb)
-        
-        # 计算网格尺寸
-        rows = (len(thumbnails) + columns - 1) // columns
-        grid_width = columns * thumbnail_size + spacing * (columns - 1)
-        grid_height = rows * thumbnail_size + spacing * (rows - 1)
-        
-        # 创建网格
-        grid = Image.new("RGB", (grid_width, grid_height), background_color)
-        
-        for i, thumb in enumerate(thumbnails):
-            row = i // columns
-            col = i % columns
+                # 居中写入缩略图
+                h, w = thumb.shape[:2]
+                y_offset = (thumbnail_size - h) // 2
+                x_offset = (thumbnail_size - w) // 2
+                cell[y_offset:y_offset + h, x_offset:x_offset + w] = thumb
+                
+                # 添加边框
+                if border_width > 0:
+                    cell[:border_width] = border_rgb
+                    cell[-border_width:] = border_rgb
+                    cell[:, :border_width] = border_rgb
+                    cell[:, -border_width:] = border_rgb
             
-            x = col * (thumbnail_size + spacing)
-            y = row * (thumbnail_size + spacing)
+            grid = Image.fromarray(grid, "RGB")
             
-            grid.paste(thumb, (x, y))
+            # 转换为base64
+            output_info = processor.output_image(grid, "batch_resize", output_format)
+            
+            return grid, output_info, len(thumbnails), rows
         
-        # 转换为base64
-        output_info = processor.output_image(grid, "batch_resize", output_format)
+        grid, output_info, thumbnail_count, rows = await run_in_thread_pool(_build_grid)
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps_json({
                 "success": True,
-                "message": f"成功创建{len(thumbnails)}个缩略图的网格",
+                "message": f"成功创建{thumbnail_count}个缩略图的网格",
                 "data": {
                     **output_info,
                     "metadata": {
-                        "thumbnail_count": len(thumbnails),
+                        "thumbnail_count": thumbnail_count,
                         "grid_size": f"{grid.width}x{grid.height}",
                         "thumbnail_size": thumbnail_size,
                         "columns": columns,
@@ -699,25 +755,177 @@ async def create_thumbnail_grid(arguments: Dict[str, Any]) -> List[TextContent]:
                         "format": output_format
                     }
                 }
-            }, ensure_ascii=False)
+            })
         )]
         
     except ValidationError as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"参数验证失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("参数验证失败", e)
     except Exception as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"创建缩略图网格失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("创建缩略图网格失败", e)
+
+def _load_source(processor: ImageProcessor, source: str,
+                 draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+    """
+    验证并加载单个图片源
+    
+    Args:
+        processor: 图片处理器
+        source: 图片源
+        draft_size: 可选的目标尺寸，JPEG图片在解码阶段直接缩小
+        
+    Returns:
+        Image.Image: 加载的图片
+    """
+    ensure_valid_image_source(source)
+    return processor.load_image_cached(source, draft_size)
+
+
+def _resize_to(image: Image.Image, size: Tuple[int, int],
+               resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
+    """
+    调整图片到指定尺寸，尺寸已一致时直接返回原图
+    
+    Args:
+        image: 原图
+        size: 目标尺寸
+        resample: 重采样方法
+        
+    Returns:
+        Image.Image: 调整后的图片
+    """
+    if image.size == tuple(size):
+        return image
+    return image.resize(size, resample, reducing_gap=2.0)
+
+
+def _fit_to_cell(image: Image.Image, cell_width: int, cell_height: int,
+                 resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
+    """
+    按比例缩小图片以放入单元格（不放大）
+    
+    Args:
+        image: 原图
+        cell_width: 单元格宽度
+        cell_height: 单元格高度
+        resample: 重采样方法
+        
+    Returns:
+        Image.Image: 缩放后的图片
+    """
+    ratio = min(cell_width / image.width, cell_height / image.height)
+    if ratio >= 1.0:
+        return image
+    
+    target_size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+    return image.resize(target_size, resample, reducing_gap=2.0)
+
+
+def _blend_channels(base: np.ndarray, top: np.ndarray, blend_mode: str) -> np.ndarray:
+    """
+    按混合模式计算颜色通道（uint16整数运算，取值范围0-255）
+    
+    Args:
+        base: 底图颜色通道
+        top: 顶图颜色通道
+        blend_mode: 混合模式
+        
+    Returns:
+        np.ndarray: 混合后的颜色通道
+    """
+    if blend_mode == "multiply":
+        return (base * top + 127) // 255
+    if blend_mode == "screen":
+        return 255 - ((255 - base) * (255 - top) + 127) // 255
+    if blend_mode == "overlay":
+        return np.where(base < 128,
+                        (2 * base * top + 127) // 255,
+                        255 - (2 * (255 - base) * (255 - top) + 127) // 255)
+    if blend_mode == "hard_light":
+        return np.where(top < 128,
+                        (2 * base * top + 127) // 255,
+                        255 - (2 * (255 - base) * (255 - top) + 127) // 255)
+    if blend_mode == "soft_light":
+        # Pegtop柔光公式: (1 - 2t) * b^2 + 2t * b
+        b = base.astype(np.float32) / 255.0
+        t = top.astype(np.float32) / 255.0
+        return np.rint(((1.0 - 2.0 * t) * b * b + 2.0 * t * b) * 255.0).astype(np.uint16)
+    # normal
+    return top
+
+
+def _to_blend_mode(image: Image.Image) -> Image.Image:
+    """
+    将图片转换为RGB或RGBA模式，只有带透明度的图片才保留Alpha通道
+    
+    Args:
+        image: 原图
+        
+    Returns:
+        Image.Image: RGB或RGBA模式的图片
+    """
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    if image.mode in ("LA", "PA", "La") or "transparency" in image.info:
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def _blend_pixels(image1: Image.Image, image2: Image.Image, blend_mode: str, opacity: float) -> Image.Image:
+    """
+    使用NumPy混合两张尺寸相同的RGB/RGBA图片
+    
+    不透明的图片不做RGBA转换，其Alpha按常量处理。
+    
+    Args:
+        image1: 底图
+        image2: 顶图
+        blend_mode: 混合模式
+        opacity: 顶图不透明度（0.0-1.0）
+        
+    Returns:
+        Image.Image: 混合后的图片（底图不透明时为RGB，否则为RGBA）
+    """
+    a = np.asarray(image1)
+    b = np.asarray(image2)
+    base = a[..., :3]
+    top = b[..., :3]
+    
+    # 调整第二张图片的透明度：预计算256项查找表，与 int(p * opacity) 结果一致
+    alpha_lut = np.minimum(np.arange(256) * opacity, 255).astype(np.uint8)
+    if image2.mode == "RGBA":
+        alpha_top = alpha_lut[b[..., 3]][..., None]
+    else:
+        alpha_top = int(alpha_lut[255])
+    
+    if blend_mode == "normal":
+        blended = top
+    else:
+        blended = _blend_channels(base.astype(np.uint16), top.astype(np.uint16), blend_mode)
+    
+    if image1.mode != "RGBA":
+        # 底图不透明：Co = (B(Cb,Cs) * as + Cb * (255 - as) + 127) // 255，整数运算并原地累加
+        work = np.multiply(blended, alpha_top, dtype=np.uint32)
+        work += np.multiply(base, 255 - np.asarray(alpha_top, dtype=np.uint32), dtype=np.uint32)
+        work += 127
+        work //= 255
+        return Image.fromarray(work.astype(np.uint8), "RGB")
+    
+    alpha_s = np.asarray(alpha_top, dtype=np.float32) / 255.0
+    
+    # 按源覆盖（source-over）合成：
+    # Co = as*(1-ab)*Cs + as*ab*B(Cb,Cs) + (1-as)*ab*Cb
+    alpha_b = a[..., 3].astype(np.float32)[..., None] / 255.0
+    alpha_out = alpha_s + alpha_b * (1.0 - alpha_s)
+    color = (alpha_s * (1.0 - alpha_b) * top
+             + alpha_s * alpha_b * blended
+             + (1.0 - alpha_s) * alpha_b * base)
+    color = np.divide(color, alpha_out, out=np.zeros_like(color), where=alpha_out > 0)
+    
+    out = np.empty(a.shape, dtype=np.uint8)
+    out[..., :3] = np.clip(np.rint(color), 0, 255)
+    out[..., 3] = np.rint(alpha_out[..., 0] * 255.0)
+    return Image.fromarray(out, "RGBA")
+
 
 async def blend_images(arguments: Dict[str, Any]) -> List[TextContent]:
     """
@@ -744,64 +952,51 @@ async def blend_images(arguments: Dict[str, Any]) -> List[TextContent]:
         # 验证参数
         validate_numeric_range(opacity, 0.0, 1.0, "opacity")
         
-        processor = ImageProcessor()
-        
-        # 加载图片
-        image1 = processor.load_image(image1_source)
-        image2 = processor.load_image(image2_source)
-        
-        # 转换为RGBA模式
-        if image1.mode != "RGBA":
-            image1 = image1.convert("RGBA")
-        if image2.mode != "RGBA":
-            image2 = image2.convert("RGBA")
-        
-        # 调整尺寸
-        if resize_mode == "fit_first":
-            image2 = image2.resize(image1.size, Image.Resampling.LANCZOS)
-            final_size = image1.size
-        elif resize_mode == "fit_second":
-            image1 = image1.resize(image2.size, Image.Resampling.LANCZOS)
-            final_size = image2.size
-        elif resize_mode == "fit_largest":
-            if image1.width * image1.height > image2.width * image2.height:
-                image2 = image2.resize(image1.size, Image.Resampling.LANCZOS)
-                final_size = image1.size
-            else:
-                image1 = image1.resize(image2.size, Image.Resampling.LANCZOS)
-                final_size = image2.size
-        else:  # fit_smallest
-            if image1.width * image1.height < image2.width * image2.height:
-                image2 = image2.resize(image1.size, Image.Resampling.LANCZOS)
+        def _blend():
+            """同步的图片混合处理逻辑，在共享线程池中执行"""
+            # 加载图片
+            image1 = processor.load_image_cached(image1_source)
+            image2 = processor.load_image_cached(image2_source)
+            
+            # 统一为RGB/RGBA模式，不透明图片不转换为RGBA
+            image1 = _to_blend_mode(image1)
+            image2 = _to_blend_mode(image2)
+            
+            # 调整尺寸
+            if resize_mode == "fit_first":
+                image2 = _resize_to(image2, image1.size)
                 final_size = image1.size
-            else:
-                image1 = image1.resize(image2.size, Image.Resampling.LANCZOS)
+            elif resize_mode == "fit_second":
+                image1 = _resize_to(image1, image2.size)
                 final_size = image2.size
+            elif resize_mode == "fit_largest":
+                if image1.width * image1.height > image2.width * image2.height:
+                    image2 = _resize_to(image2, image1.size)
+                    final_size = image1.size
+                else:
+                    image1 = _resize_to(image1, image2.size)
+                    final_size = image2.size
+            else:  # fit_smallest
+                if image1.width * image1.height < image2.width * image2.height:
+                    image2 = _resize_to(image2, image1.size)
+                    final_size = image1.size
+                else:
+                    image1 = _resize_to(image1, image2.size)
+                    final_size = image2.size
+            
+            # 应用混合模式（NumPy向量化计算）
+            result = _blend_pixels(image1, image2, blend_mode, opacity)
+            
+            # 转换为base64
+            output_info = processor.output_image(result, "batch_resize", output_format)
+            
+            return result, output_info
         
-        # 调整第二张图片的透明度
-        alpha_channel = image2.split()[-1]
-        alpha_channel = alpha_channel.point(lambda p: int(p * opacity))
-        image2.putalpha(alpha_channel)
-        
-        # 应用混合模式
-        if blend_mode == "normal":
-            result = Image.alpha_composite(image1, image2)
-        elif blend_mode == "multiply":
-            # 简化的乘法混合
-            result = Image.blend(image1, image2, opacity)
-        elif blend_mode == "screen":
-            # 简化的屏幕混合
-            result = Image.blend(image1, image2, opacity)
-        else:
-            # 其他混合模式使用普通混合
-            result = Image.alpha_composite(image1, image2)
-        
-        # 转换为base64
-        output_info = processor.output_image(result, "batch_resize", output_format)
+        result, output_info = await run_in_thread_pool(_blend)
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps_json({
                 "success": True,
                 "message": f"成功混合图片，使用{blend_mode}模式",
                 "data": {
@@ -814,25 +1009,13 @@ async def blend_images(arguments: Dict[str, Any]) -> List[TextContent]:
                         "format": output_format
                     }
                 }
-            }, ensure_ascii=False)
+            })
         )]
         
     except ValidationError as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"参数验证失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("参数验证失败", e)
     except Exception as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"混合图片失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("混合图片失败", e)
 
 async def extract_colors(arguments: Dict[str, Any]) -> List[TextContent]:
     """
@@ -850,6 +1033,7 @@ async def extract_colors(arguments: Dict[str, Any]) -> List[TextContent]:
         ensure_valid_image_source(image_source)
         
         color_count = arguments.get("color_count") or arguments.get("num_colors", 5)
+        quantize_method = arguments.get("quantize_method", "FASTOCTREE")
         create_palette = arguments.get("create_palette", True)
         palette_width = arguments.get("palette_width", 400)
         palette_height = arguments.get("palette_height", 100)
@@ -859,87 +1043,152 @@ async def extract_colors(arguments: Dict[str, Any]) -> List[TextContent]:
         validate_numeric_range(palette_width, 100, 800, "palette_width")
         validate_numeric_range(palette_height, 50, 200, "palette_height")
         
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 转换为RGB模式
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-        
-        # 使用量化来提取主要颜色
-        quantized = image.quantize(colors=color_count)
-        palette_colors = quantized.getpalette()
-        
-        # 提取RGB颜色值
-        colors = []
-        # 确保不超过实际可用的颜色数量
-        actual_color_count = min(color_count, len(palette_colors) // 3)
-        
-        for i in range(actual_color_count):
-            try:
-                r = palette_colors[i * 3]
-                g = palette_colors[i * 3 + 1] 
-                b = palette_colors[i * 3 + 2]
-                hex_color = f"#{r:02x}{g:02x}{b:02x}"
-                colors.append({
+        def _extract():
+            """同步的颜色提取逻辑，在共享线程池中执行"""
+            image = processor.load_image_cached(image_source)
+            
+            image_size = f"{image.width}x{image.height}"
+            
+            # 先按最近邻采样缩小再量化（不混合颜色），减少量化器需要处理的像素数
+            if max(image.size) > _COLOR_SAMPLE_SIZE:
+                image.thumbnail((_COLOR_SAMPLE_SIZE, _COLOR_SAMPLE_SIZE), Image.Resampling.NEAREST)
+            
+            # 采样后再转换为RGB模式，只需转换缩小后的图片
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            
+            # 使用量化来提取主要颜色
+            method = _QUANTIZE_MAP.get(quantize_method, Image.Quantize.FASTOCTREE)
+            quantized = image.quantize(colors=color_count, method=method)
+            palette_colors = quantized.getpalette()
+            
+            # 提取RGB颜色值（确保不超过实际可用的颜色数量）
+            actual_color_count = min(color_count, len(palette_colors) // 3)
+            palette_bytes = bytes(palette_colors[:actual_color_count * 3])
+            # 一次性转换为十六进制字符串，每种颜色取6个字符
+            hex_string = palette_bytes.hex()
+            # 量化结果本身就是像素到颜色的映射，直接用索引直方图统计各颜色占比
+            counts = quantized.histogram()
+            total_pixels = quantized.width * quantized.height
+            colors = [
+                {
                     "rgb": [r, g, b],
-                    "hex": hex_color
-                })
-            except IndexError:
-                # 如果索引越界，停止添加颜色
-                break
-        
-        result_data = {
-            "success": True,
-            "message": f"成功提取{len(colors)}种主要颜色",
-            "colors": colors,
-            "metadata": {
-                "image_size": f"{image.width}x{image.height}",
-                "color_count": len(colors)
+                    "hex": f"#{hex_string[i * 6:i * 6 + 6]}",
+                    "percentage": round(counts[i] * 100 / total_pixels, 2)
+                }
+                for i, (r, g, b) in enumerate(struct.iter_unpack("BBB", palette_bytes))
+            ]
+            
+            result_data = {
+                "success": True,
+                "message": f"成功提取{len(colors)}种主要颜色",
+                "colors": colors,
+                "metadata": {
+                    "image_size": image_size,
+                    "color_count": len(colors),
+                    "quantize_method": quantize_method
+                }
             }
-        }
-        
-        # 创建调色板图片
-        if create_palette:
-            palette_image = Image.new("RGB", (palette_width, palette_height))
-            color_width = palette_width // len(colors)
             
-            for i, color_info in enumerate(colors):
-                color_rgb = tuple(color_info["rgb"])
-                x1 = i * color_width
-                x2 = (i + 1) * color_width if i < len(colors) - 1 else palette_width
-                
-                # 填充颜色块
-                for x in range(x1, x2):
-                    for y in range(palette_height):
-                        palette_image.putpixel((x, y), color_rgb)
+            # 创建调色板图片（没有提取到颜色时直接跳过）
+            if create_palette and colors:
+                palette_image = Image.new("RGB", (palette_width, palette_height))
+                draw = ImageDraw.Draw(palette_image)
+                color_width = palette_width // len(colors)
             
-            # 输出调色板图片
-            palette_output = processor.output_image(palette_image, "extract_colors", "PNG")
-            result_data["palette"] = palette_output
-            result_data["metadata"]["palette_size"] = f"{palette_width}x{palette_height}"
+                for i, color_info in enumerate(colors):
+                    x1 = i * color_width
+                    x2 = (i + 1) * color_width if i < len(colors) - 1 else palette_width
+            
+                    # 直接在画布上填充颜色块，无需中间数组
+                    draw.rectangle([x1, 0, x2 - 1, palette_height - 1], fill=tuple(color_info["rgb"]))
+            
+                # 输出调色板图片
+                palette_output = processor.output_image(palette_image, "extract_colors", "PNG")
+                result_data["palette"] = palette_output
+                result_data["metadata"]["palette_size"] = f"{palette_width}x{palette_height}"
+            
+            return result_data
+        
+        result_data = await run_in_thread_pool(_extract)
         
         return [TextContent(
             type="text",
-            text=json.dumps(result_data, ensure_ascii=False)
+            text=dumps_json(result_data)
         )]
         
     except ValidationError as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"参数验证失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("参数验证失败", e)
     except Exception as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"提取颜色失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("提取颜色失败", e)
+
+def _gif_palette(frames: List[Image.Image]) -> Image.Image:
+    """
+    根据缩小采样后的帧拟合所有帧共用的调色板
+    
+    Args:
+        frames: 尺寸一致的RGB帧列表
+        
+    Returns:
+        Image.Image: 带有255色调色板的P模式参考图（预留一个索引给透明色）
+    """
+    width, height = frames[0].size
+    scale = min(1.0, _COLOR_SAMPLE_SIZE / max(width, height))
+    sample_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    
+    # 各帧最近邻采样缩小后横向拼接，只做一次调色板拟合
+    samples = [np.asarray(_resize_to(frame, sample_size, Image.Resampling.NEAREST)) for frame in frames]
+    strip = Image.fromarray(np.hstack(samples), "RGB")
+    return strip.quantize(colors=255, method=Image.Quantize.FASTOCTREE)
+
+
+def _quantize_gif_frames(frames: List[Image.Image], palette_image: Image.Image) -> List[Image.Image]:
+    """
+    将RGB帧映射到共享调色板，避免保存GIF时逐帧重新量化
+    
+    Args:
+        frames: RGB帧列表
+        palette_image: 共享调色板参考图
+        
+    Returns:
+        List[Image.Image]: P模式帧列表
+    """
+    return [frame.quantize(palette=palette_image, dither=Image.Dither.NONE) for frame in frames]
+
+
+def _diff_gif_frames(frames: List[Image.Image], palette_image: Image.Image) -> List[Image.Image]:
+    """
+    将尺寸一致的RGB帧映射到共享调色板，并把与上一帧相同的像素替换为透明索引0
+    
+    Args:
+        frames: 尺寸一致的RGB帧列表
+        palette_image: 共享调色板参考图
+        
+    Returns:
+        List[Image.Image]: P模式帧列表（索引0为透明色，配合disposal=1保存）
+    """
+    # 所有帧横向拼接后一次性映射到共享调色板
+    strip = Image.fromarray(np.hstack([np.asarray(frame) for frame in frames]), "RGB")
+    quantized = strip.quantize(palette=palette_image, dither=Image.Dither.NONE)
+    palette = [0, 0, 0] + palette_image.getpalette()[:255 * 3]
+    
+    # 颜色索引整体后移一位，空出索引0作为透明色
+    indices = np.hsplit(np.asarray(quantized) + np.uint8(1), len(frames))
+    
+    # 从最后一帧向前原地置零，比较时上一帧仍是原始索引；掩码缓冲区复用，不产生临时数组
+    mask = np.empty(indices[0].shape, dtype=bool)
+    for i in range(len(indices) - 1, 0, -1):
+        np.equal(indices[i], indices[i - 1], out=mask)
+        np.putmask(indices[i], mask, 0)
+    
+    diff_frames = []
+    for frame_indices in indices:
+        frame = Image.fromarray(np.ascontiguousarray(frame_indices), "P")
+        frame.putpalette(palette)
+        diff_frames.append(frame)
+    
+    return diff_frames
+
 
 async def create_gif(arguments: Dict[str, Any]) -> List[TextContent]:
     """
@@ -961,71 +1210,95 @@ async def create_gif(arguments: Dict[str, Any]) -> List[TextContent]:
         loop = arguments.get("loop", 0)  # 默认0表示无限循环
         optimize = arguments.get("optimize", True)
         resize_to = arguments.get("resize_to")
+        resample_method = arguments.get("resample_method", "BILINEAR")
+        diff_optimize = arguments.get("diff_optimize", True)
         
         # 验证参数
         validate_numeric_range(duration, 100, 5000, "duration")
         
-        processor = ImageProcessor()
-        frames = []
+        # 获取重采样方法（帧最终会量化为调色板图像，LANCZOS的额外精度会被抹掉）
+        resample = _RESAMPLE_MAP.get(resample_method, Image.Resampling.BILINEAR)
         
-        # 加载所有图片
-        for source in image_sources:
+        def _load_frame(source):
+            """加载单帧图片并转换为RGB模式"""
             ensure_valid_image_source(source)
-            image = processor.load_image(source)
+            image = processor.load_image_cached(source)
             
             # 转换为RGB模式（GIF不支持RGBA）
             if image.mode != "RGB":
                 if image.mode == "RGBA":
-                    # 创建白色背景
+                    # 创建白色背景，直接以RGBA图片自身的alpha作为蒙版，无需拆分通道
                     background = Image.new("RGB", image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[-1])
+                    background.paste(image, mask=image)
                     image = background
                 else:
                     image = image.convert("RGB")
             
-            frames.append(image)
+            return image
         
-        # 调整所有帧到相同尺寸
-        if resize_to:
-            target_width = resize_to.get("width")
-            target_height = resize_to.get("height")
-            if target_width and target_height:
-                frames = [frame.resize((target_width, target_height), Image.Resampling.LANCZOS) 
-                         for frame in frames]
-        else:
-            # 使用第一帧的尺寸
-            target_size = frames[0].size
-            frames = [frame.resize(target_size, Image.Resampling.LANCZOS) for frame in frames]
-        
-        # 生成唯一文件名并保存到temp目录
-        import uuid
-        import os
-        from config import TEMP_DIR
-        
-        unique_id = str(uuid.uuid4())[:8]
-        gif_filename = f"gif_{unique_id}.gif"
-        gif_path = os.path.join(TEMP_DIR, gif_filename)
-        
-        # 确保temp目录存在
-        os.makedirs(TEMP_DIR, exist_ok=True)
-        
-        # 创建并保存GIF
-        frames[0].save(
-            gif_path,
-            format="GIF",
-            save_all=True,
-            append_images=frames[1:],
-            duration=duration,
-            loop=loop,  # 直接使用传入的整数值：0=无限循环，1=播放一次，n=循环n次
-            optimize=optimize
+        # 并行加载所有帧
+        frames = await asyncio.gather(
+            *(run_in_thread_pool(_load_frame, source) for source in image_sources)
         )
         
-        # 获取文件大小
-        file_size = os.path.getsize(gif_path)
+        def _build_gif():
+            """同步的GIF生成逻辑，在共享线程池中执行"""
+            nonlocal frames
+            
+            # 调整所有帧到相同尺寸（共用调色板和帧间差分都要求尺寸一致）
+            target_width = resize_to.get("width") if resize_to else None
+            target_height = resize_to.get("height") if resize_to else None
+            if target_width and target_height:
+                target_size = (target_width, target_height)
+            else:
+                # 未完整指定尺寸时使用第一帧的尺寸，尺寸已一致的帧（包括第一帧）不再重采样
+                target_size = frames[0].size
+            frames = [_resize_to(frame, target_size, resample) for frame in frames]
+            
+            # 所有帧共用一次拟合的调色板，保存时不再逐帧量化
+            palette_image = _gif_palette(frames)
+            
+            # 帧间差分：未变化的像素使用透明索引，保留上一帧画面（disposal=1）
+            save_options = {}
+            if diff_optimize:
+                frames = _diff_gif_frames(frames, palette_image)
+                save_options = {"transparency": 0, "disposal": 1}
+            else:
+                frames = _quantize_gif_frames(frames, palette_image)
+            
+            # 生成唯一文件名并保存到temp目录
+            import uuid
+            import os
+            from config import TEMP_DIR
+            
+            unique_id = str(uuid.uuid4())[:8]
+            gif_filename = f"gif_{unique_id}.gif"
+            gif_path = os.path.join(TEMP_DIR, gif_filename)
+            
+            # 确保temp目录存在
+            os.makedirs(TEMP_DIR, exist_ok=True)
+            
+            # 创建并直接写入GIF文件，写入结束时的文件偏移即为文件大小
+            with open(gif_path, "wb") as gif_file:
+                frames[0].save(
+                    gif_file,
+                    format="GIF",
+                    save_all=True,
+                    append_images=frames[1:],
+                    duration=duration,
+                    loop=loop,  # 直接使用传入的整数值：0=无限循环，1=播放一次，n=循环n次
+                    optimize=optimize,
+                    **save_options
+                )
+                file_size = gif_file.tell()
+            
+            return gif_path, file_size, frames
+        
+        gif_path, file_size, frames = await run_in_thread_pool(_build_gif)
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps_json({
                 "success": True,
                 "message": f"成功创建包含{len(frames)}帧的GIF动画",
                 "data": {
@@ -1038,24 +1311,14 @@ async def create_gif(arguments: Dict[str, Any]) -> List[TextContent]:
                     "size": [frames[0].width, frames[0].height],
                     "duration": duration,
                     "loop": loop,
-                    "optimize": optimize
+                    "optimize": optimize,
+                    "diff_optimize": diff_optimize,
+                    "resample_method": resample_method
                 }
-            }, ensure_ascii=False)
+            })
         )]
         
     except ValidationError as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"参数验证失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
+        return _error_response("参数验证失败", e)
     except Exception as e:
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "success": False,
-                "error": f"创建GIF失败: {str(e)}"
-            }, ensure_ascii=False)
-        )]
\ No newline at end of file
+        return _error_response("创建GIF失败", e)
\ No newline at end of file
@@ -18,6 +18,11 @@ def get_basic_tools() -> List[Tool]:
                     "source": {
                         "type": "string",
                         "description": "图片源：文件路径或base64编码字符串"
+                    },
+                    "include_data": {
+                        "type": "boolean",
+                        "description": "是否输出图片文件引用（为false时只返回图片信息，不重新编码图片）",
+                        "default": True
                     }
                 },
                 "required": ["source"]
@@ -96,19 +101,20 @@ def get_basic_tools() -> List[Tool]:
 
 from utils.image_processor import ImageProcessor
 from utils.validation import ensure_valid_image_source, validate_image_format, ValidationError
+from utils.serialization import dumps_json
 from mcp.types import TextContent
-import json
 import os
 
 # 全局图片处理器实例
 processor = ImageProcessor()
 
-async def load_image(source: str) -> list[TextContent]:
+async def load_image(source: str, include_data: bool = True) -> list[TextContent]:
     """
     加载图片
     
     Args:
         source: 图片源（文件路径或base64编码）
+        include_data: 是否输出图片文件引用，为False时只返回图片信息
         
     Returns:
         包含图片信息和文件引用的响应
@@ -123,8 +129,8 @@ async def load_image(source: str) -> list[TextContent]:
         # 获取图片信息
         info = processor.get_image_info(image)
         
-        # 输出图片（文件引用模式）
-        output_info = processor.output_image(image, "loaded")
+        # 输出图片（文件引用模式），只需要信息时跳过解码和重新编码
+        output_info = processor.output_image(image, "loaded") if include_data else {}
         
         result = {
             "success": True,
@@ -135,21 +141,21 @@ async def load_image(source: str) -> list[TextContent]:
             }
         }
         
-        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(result))]
         
     except ValidationError as e:
         error_result = {
             "success": False,
             "error": f"参数验证失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
         
     except Exception as e:
         error_result = {
             "success": False,
             "error": f"图片加载失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
 
 async def save_image(image_data: str, output_path: str, format: str = "PNG", quality: int = 95) -> list[TextContent]:
     """
@@ -195,21 +201,21 @@ async def save_image(image_data: str, output_path: str, format: str = "PNG", qua
             }
         }
         
-        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(result))]
         
     except ValidationError as e:
         error_result = {
             "success": False,
             "error": f"参数验证失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
         
     except Exception as e:
         error_result = {
             "success": False,
             "error": f"图片保存失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
 
 async def get_image_info(image_source: str) -> list[TextContent]:
     """
@@ -232,11 +238,13 @@ async def get_image_info(image_source: str) -> list[TextContent]:
         # 获取详细信息
         info = processor.get_image_info(image)
         
-        # 计算图片大小（字节）
-        import io
-        buffer = io.BytesIO()
-        image.save(buffer, format=image.format or 'PNG')
-        data_size = len(buffer.getvalue())
+        # 计算图片大小（字节）：直接取源数据长度，无需重新编码
+        is_file = not image_source.startswith('data:image') and os.path.exists(image_source)
+        if is_file:
+            data_size = os.path.getsize(image_source)
+        else:
+            encoded = image_source.partition(',')[2].rstrip('=')
+            data_size = len(encoded) * 3 // 4
         
         # 扩展信息
         extended_info = {
@@ -247,9 +255,9 @@ async def get_image_info(image_source: str) -> list[TextContent]:
         }
         
         # 如果是文件路径，添加文件信息
-        if not image_source.startswith('data:image') and os.path.exists(image_source):
+        if is_file:
             extended_info["file_path"] = image_source
-            extended_info["file_size_bytes"] = os.path.getsize(image_source)
+            extended_info["file_size_bytes"] = data_size
         
         result = {
             "success": True,
@@ -257,21 +265,21 @@ async def get_image_info(image_source: str) -> list[TextContent]:
             "data": extended_info
         }
         
-        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(result))]
         
     except ValidationError as e:
         error_result = {
             "success": False,
             "error": f"参数验证失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
         
     except Exception as e:
         error_result = {
             "success": False,
             "error": f"获取图片信息失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
 
 async def convert_format(image_source: str, target_format: str, quality: int = 95) -> list[TextContent]:
     """
@@ -316,18 +324,18 @@ async def convert_format(image_source: str, target_format: str, quality: int = 9
             }
         }
         
-        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(result))]
         
     except ValidationError as e:
         error_result = {
             "success": False,
             "error": f"参数验证失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
+        return [TextContent(type="text", text=dumps_json(error_result))]
         
     except Exception as e:
         error_result = {
             "success": False,
             "error": f"格式转换失败: {str(e)}"
         }
-        return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False))]
\ No newline at end of file
+        return [TextContent(type="text", text=dumps_json(error_result))]
\ No newline at end of file
@@ -5,15 +5,18 @@
 """
 
 from typing import List, Dict, Any, Tuple, Optional
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageEnhance, ImageFont
+from functools import lru_cache
+from jsonschema import Draft7Validator
 import numpy as np
 from mcp.types import Tool, TextContent
 import json
 import asyncio
 
 from utils.image_processor import ImageProcessor
+from utils.performance import run_in_thread_pool
 from utils.validation import (
-    validate_image_source, validate_numeric_range, validate_color_hex,
+    validate_image_source, validate_color_hex,
     ensure_valid_image_source, ValidationError
 )
 from config import (
@@ -21,6 +24,9 @@ from config import (
     DEFAULT_FORMAT, DEFAULT_QUALITY, DEFAULT_IMAGE_FORMAT
 )
 
+# 全局图片处理器实例
+processor = ImageProcessor()
+
 def get_effect_tools() -> List[Tool]:
     """
     返回特效处理工具列表
@@ -43,7 +49,6 @@ def get_effect_tools() -> List[Tool]:
                         "type": "integer",
                         "description": "边框宽度（像素）",
                         "minimum": 1,
-                        "maximum": 100,
                         "default": 10
                     },
                     "border_color": {
@@ -61,12 +66,11 @@ def get_effect_tools() -> List[Tool]:
                         "type": "integer",
                         "description": "圆角半径（仅当border_style为rounded时有效）",
                         "minimum": 0,
-                        "maximum": 50,
                         "default": 10
                     },
                     "output_format": {
                         "type": "string",
-                        "description": "输出格式",
+                        "description": "输出格式（不区分大小写）",
                         "enum": ["PNG", "JPEG", "WEBP"],
                         "default": "PNG"
                     }
@@ -103,7 +107,7 @@ def get_effect_tools() -> List[Tool]:
                     },
                     "output_format": {
                         "type": "string",
-                        "description": "输出格式",
+                        "description": "输出格式（不区分大小写）",
                         "enum": ["PNG", "JPEG", "WEBP"],
                         "default": "PNG"
                     }
@@ -129,22 +133,17 @@ def get_effect_tools() -> List[Tool]:
                     "shadow_offset_x": {
                         "type": "integer",
                         "description": "阴影X轴偏移（像素）",
-                        "minimum": -50,
-                        "maximum": 50,
                         "default": 5
                     },
                     "shadow_offset_y": {
                         "type": "integer",
                         "description": "阴影Y轴偏移（像素）",
-                        "minimum": -50,
-                        "maximum": 50,
                         "default": 5
                     },
                     "shadow_blur": {
                         "type": "integer",
                         "description": "阴影模糊半径",
                         "minimum": 0,
-                        "maximum": 20,
                         "default": 5
                     },
                     "shadow_opacity": {
@@ -156,7 +155,7 @@ def get_effect_tools() -> List[Tool]:
                     },
                     "output_format": {
                         "type": "string",
-                        "description": "输出格式",
+                        "description": "输出格式（不区分大小写）",
                         "enum": ["PNG", "JPEG", "WEBP"],
                         "default": "PNG"
                     }
@@ -198,13 +197,12 @@ def get_effect_tools() -> List[Tool]:
                     "scale": {
                         "type": "number",
                         "description": "水印缩放比例",
-                        "minimum": 0.1,
-                        "maximum": 2.0,
+                        "exclusiveMinimum": 0,
                         "default": 0.2
                     },
                     "output_format": {
                         "type": "string",
-                        "description": "输出格式",
+                        "description": "输出格式（不区分大小写）",
                         "enum": ["PNG", "JPEG", "WEBP"],
                         "default": "PNG"
                     }
@@ -243,7 +241,7 @@ def get_effect_tools() -> List[Tool]:
                     },
                     "output_format": {
                         "type": "string",
-                        "description": "输出格式",
+                        "description": "输出格式（不区分大小写）",
                         "enum": ["PNG", "JPEG", "WEBP"],
                         "default": "PNG"
                     }
@@ -264,8 +262,7 @@ def get_effect_tools() -> List[Tool]:
                     "border_width": {
                         "type": "integer",
                         "description": "边框宽度（像素）",
-                        "minimum": 10,
-                        "maximum": 100,
+                        "minimum": 1,
                         "default": 40
                     },
                     "bottom_border": {
@@ -289,7 +286,7 @@ def get_effect_tools() -> List[Tool]:
                     },
                     "output_format": {
                         "type": "string",
-                        "description": "输出格式",
+                        "description": "输出格式（不区分大小写）",
                         "enum": ["PNG", "JPEG", "WEBP"],
                         "default": "PNG"
                     }
@@ -299,6 +296,87 @@ def get_effect_tools() -> List[Tool]:
         )
     ]
 
+# 按工具名预编译的参数校验器（导入时根据工具的inputSchema构建一次）
+_ARGUMENT_VALIDATORS = {
+    tool.name: Draft7Validator(tool.inputSchema) for tool in get_effect_tools()
+}
+
+def _validate_arguments(tool_name: str, arguments: Dict[str, Any]) -> None:
+    """
+    按工具的inputSchema校验参数，值为None的可选参数视为未提供，输出格式不区分大小写
+    
+    Args:
+        tool_name: 工具名称
+        arguments: 参数字典
+        
+    Raises:
+        ValidationError: 参数不符合schema时抛出
+    """
+    provided = {key: value for key, value in arguments.items() if value is not None}
+    # 输出格式不区分大小写，按大写与schema中的枚举值比较
+    if isinstance(provided.get("output_format"), str):
+        provided["output_format"] = provided["output_format"].upper()
+    error = next(_ARGUMENT_VALIDATORS[tool_name].iter_errors(provided), None)
+    if error is not None:
+        field = ".".join(str(part) for part in error.path) or "arguments"
+        raise ValidationError(f"{field}: {error.message}")
+
+@lru_cache(maxsize=32)
+def _load_font(size: int):
+    """
+    加载水印字体（按字号缓存，避免每次调用都读取并解析字体文件）
+    
+    Args:
+        size: 字号
+        
+    Returns:
+        字体对象，系统字体不可用时返回默认字体
+    """
+    try:
+        # 尝试使用系统字体
+        return ImageFont.truetype("arial.ttf", size)
+    except Exception:
+        # 使用默认字体
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=256)
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """
+    解析十六进制颜色（结果按颜色字符串缓存）
+    
+    Args:
+        color: 十六进制颜色（#RGB、#RRGGBB或#RRGGBBAA）
+        
+    Returns:
+        Tuple[int, int, int]: RGB颜色值，忽略alpha分量
+    """
+    return ImageColor.getrgb(color)[:3]
+
+@lru_cache(maxsize=64)
+def _opacity_table(opacity: float) -> tuple:
+    """
+    构建按不透明度缩放alpha通道的查找表，与int(p * opacity)逐项一致
+    
+    Args:
+        opacity: 不透明度（0.0-1.0）
+        
+    Returns:
+        256项的查找表
+    """
+    return tuple(int(i * opacity) for i in range(256))
+
+def _has_alpha(image: Image.Image) -> bool:
+    """
+    判断图片是否带有透明度信息
+    
+    Args:
+        image: PIL Image对象
+        
+    Returns:
+        bool: 带alpha通道或透明色时返回True，完全不透明时返回False
+    """
+    return "A" in image.getbands() or "transparency" in image.info
+
 # 特效处理函数实现
 
 async def add_border(arguments: Dict[str, Any]) -> List[TextContent]:
@@ -323,60 +401,63 @@ async def add_border(arguments: Dict[str, Any]) -> List[TextContent]:
         output_format = arguments.get("output_format", DEFAULT_IMAGE_FORMAT)
         
         # 验证参数
-        validate_numeric_range(border_width, 1, 100, "border_width")
+        _validate_arguments("add_border", arguments)
         validate_color_hex(border_color)
-        validate_numeric_range(corner_radius, 0, 50, "corner_radius")
-        
-        # 加载图片
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 创建带边框的新图片
-        new_width = image.width + 2 * border_width
-        new_height = image.height + 2 * border_width
         
-        if border_style == "rounded":
-            # 圆角边框
-            bordered_image = Image.new("RGBA", (new_width, new_height), border_color)
-            
-            # 创建圆角遮罩
-            mask = Image.new("L", (new_width, new_height), 0)
-            draw = ImageDraw.Draw(mask)
-            draw.rounded_rectangle(
-                [0, 0, new_width, new_height],
-                radius=corner_radius,
-                fill=255
-            )
-            
-            # 应用遮罩
-            bordered_image.putalpha(mask)
-            
-            # 粘贴原图片
-            if image.mode != "RGBA":
-                image = image.convert("RGBA")
-            bordered_image.paste(image, (border_width, border_width), image)
+        def _process():
+            # 加载图片
+            image = processor.load_image(image_source)
             
-        elif border_style == "shadow":
-            # 阴影边框
-            bordered_image = Image.new("RGBA", (new_width + 10, new_height + 10), (0, 0, 0, 0))
+            # 创建带边框的新图片
+            new_width = image.width + 2 * border_width
+            new_height = image.height + 2 * border_width
             
-            # 创建阴影
-            shadow = Image.new("RGBA", (new_width, new_height), border_color + "80")
-            shadow = shadow.filter(ImageFilter.GaussianBlur(radius=5))
-            bordered_image.paste(shadow, (10, 10), shadow)
-            
-            # 粘贴原图片
-            if image.mode != "RGBA":
-                image = image.convert("RGBA")
-            bordered_image.paste(image, (border_width, border_width), image)
+            if border_style == "rounded":
+                # 圆角边框：在透明画布上直接绘制不透明的圆角矩形，无需单独的遮罩图层
+                border_rgb = _hex_to_rgb(border_color)
+                bordered_image = Image.new("RGBA", (new_width, new_height), border_rgb + (0,))
+                draw = ImageDraw.Draw(bordered_image)
+                draw.rounded_rectangle(
+                    [0, 0, new_width, new_height],
+                    radius=corner_radius,
+                    fill=border_rgb + (255,)
+                )
+                
+                # 粘贴原图片（完全不透明的图片直接覆盖，无需转换和遮罩）
+                if _has_alpha(image):
+                    if image.mode != "RGBA":
+                        image = image.convert("RGBA")
+                    bordered_image.paste(image, (border_width, border_width), image)
+                else:
+                    bordered_image.paste(image, (border_width, border_width))
+                
+            elif border_style == "shadow":
+                # 阴影边框
+                bordered_image = Image.new("RGBA", (new_width + 10, new_height + 10), (0, 0, 0, 0))
+                
+                # 创建阴影
+                shadow = Image.new("RGBA", (new_width, new_height), border_color + "80")
+                shadow = shadow.filter(ImageFilter.GaussianBlur(radius=5))
+                bordered_image.paste(shadow, (10, 10), shadow)
+                
+                # 粘贴原图片（完全不透明的图片直接覆盖，无需转换和遮罩）
+                if _has_alpha(image):
+                    if image.mode != "RGBA":
+                        image = image.convert("RGBA")
+                    bordered_image.paste(image, (border_width, border_width), image)
+                else:
+                    bordered_image.paste(image, (border_width, border_width))
+                
+            else:
+                # 实心边框
+                bordered_image = Image.new("RGB", (new_width, new_height), border_color)
+                bordered_image.paste(image, (border_width, border_width))
             
-        else:
-            # 实心边框
-            bordered_image = Image.new("RGB", (new_width, new_height), border_color)
-            bordered_image.paste(image, (border_width, border_width))
+            # 转换为base64
+            return image, bordered_image, processor.output_image(bordered_image, "border", output_format)
         
-        # 转换为base64
-        output_info = processor.output_image(bordered_image, "border", output_format)
+        # 在线程池中处理，避免阻塞事件循环
+        image, bordered_image, output_info = await run_in_thread_pool(_process)
         
         return [TextContent(
             type="text",
@@ -435,49 +516,42 @@ async def create_silhouette(arguments: Dict[str, Any]) -> List[TextContent]:
         output_format = arguments.get("output_format", DEFAULT_IMAGE_FORMAT)
         
         # 验证参数
+        _validate_arguments("create_silhouette", arguments)
         validate_color_hex(silhouette_color)
         if background_color != "transparent":
             validate_color_hex(background_color)
-        validate_numeric_range(threshold, 0, 255, "threshold")
-        
-        # 加载图片
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 转换为RGBA模式
-        if image.mode != "RGBA":
-            image = image.convert("RGBA")
-        
-        # 创建剪影
-        silhouette = Image.new("RGBA", image.size, (0, 0, 0, 0))
-        
-        # 获取像素数据
-        pixels = image.load()
-        silhouette_pixels = silhouette.load()
         
-        # 解析剪影颜色
-        silhouette_rgb = tuple(int(silhouette_color[i:i+2], 16) for i in (1, 3, 5))
-        
-        for y in range(image.height):
-            for x in range(image.width):
-                r, g, b, a = pixels[x, y]
-                
-                # 如果像素不透明度大于阈值，则设为剪影颜色
-                if a > threshold:
-                    silhouette_pixels[x, y] = silhouette_rgb + (255,)
-                else:
-                    silhouette_pixels[x, y] = (0, 0, 0, 0)
-        
-        # 处理背景
-        if background_color != "transparent":
-            background_rgb = tuple(int(background_color[i:i+2], 16) for i in (1, 3, 5))
-            final_image = Image.new("RGB", image.size, background_rgb)
-            final_image.paste(silhouette, (0, 0), silhouette)
-        else:
-            final_image = silhouette
+        def _process():
+            # 加载图片
+            image = processor.load_image(image_source)
+            
+            # 解析剪影颜色
+            silhouette_rgb = _hex_to_rgb(silhouette_color)
+            
+            # 处理背景
+            if background_color != "transparent":
+                mode, fill = "RGB", silhouette_rgb
+                background = _hex_to_rgb(background_color)
+            else:
+                mode, fill = "RGBA", silhouette_rgb + (255,)
+                background = (0, 0, 0, 0)
+            
+            # 像素不透明度大于阈值的位置设为剪影颜色
+            if _has_alpha(image):
+                # 只需对alpha通道查表得到遮罩，只有透明色的图片才需要转换为RGBA
+                alpha = image.getchannel("A") if "A" in image.getbands() else image.convert("RGBA").getchannel("A")
+                mask = alpha.point([255 if a > threshold else 0 for a in range(256)])
+                final_image = Image.new(mode, image.size, background)
+                final_image.paste(fill, mask=mask)
+            else:
+                # 完全不透明的图片整体都是剪影（阈值为255时整体都不是），无需转换和查表
+                final_image = Image.new(mode, image.size, fill if threshold < 255 else background)
+            
+            # 转换为base64
+            return image, processor.output_image(final_image, "silhouette", output_format)
         
-        # 转换为base64
-        output_info = processor.output_image(final_image, "silhouette", output_format)
+        # 在线程池中处理，避免阻塞事件循环
+        image, output_info = await run_in_thread_pool(_process)
         
         return [TextContent(
             type="text",
@@ -537,62 +611,62 @@ async def add_shadow(arguments: Dict[str, Any]) -> List[TextContent]:
         output_format = arguments.get("output_format", DEFAULT_IMAGE_FORMAT)
         
         # 验证参数
+        _validate_arguments("add_shadow", arguments)
         validate_color_hex(shadow_color)
-        validate_numeric_range(shadow_offset_x, -50, 50, "shadow_offset_x")
-        validate_numeric_range(shadow_offset_y, -50, 50, "shadow_offset_y")
-        validate_numeric_range(shadow_blur, 0, 20, "shadow_blur")
-        validate_numeric_range(shadow_opacity, 0.0, 1.0, "shadow_opacity")
-        
-        # 加载图片
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 转换为RGBA模式
-        if image.mode != "RGBA":
-            image = image.convert("RGBA")
-        
-        # 计算新图片尺寸（考虑阴影偏移和模糊）
-        margin = shadow_blur + max(abs(shadow_offset_x), abs(shadow_offset_y))
-        new_width = image.width + 2 * margin
-        new_height = image.height + 2 * margin
-        
-        # 创建带阴影的新图片
-        result_image = Image.new("RGBA", (new_width, new_height), (0, 0, 0, 0))
-        
-        # 创建阴影
-        shadow_rgb = tuple(int(shadow_color[i:i+2], 16) for i in (1, 3, 5))
-        shadow_alpha = int(255 * shadow_opacity)
-        
-        # 创建阴影图层
-        shadow_layer = Image.new("RGBA", image.size, (0, 0, 0, 0))
-        shadow_pixels = shadow_layer.load()
-        image_pixels = image.load()
-        
-        # 根据原图的alpha通道创建阴影
-        for y in range(image.height):
-            for x in range(image.width):
-                r, g, b, a = image_pixels[x, y]
-                if a > 0:
-                    shadow_pixels[x, y] = shadow_rgb + (min(a, shadow_alpha),)
-        
-        # 应用模糊
-        if shadow_blur > 0:
-            shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(radius=shadow_blur))
-        
-        # 计算阴影位置
-        shadow_x = margin + shadow_offset_x
-        shadow_y = margin + shadow_offset_y
-        
-        # 粘贴阴影
-        result_image.paste(shadow_layer, (shadow_x, shadow_y), shadow_layer)
-        
-        # 粘贴原图片
-        image_x = margin
-        image_y = margin
-        result_image.paste(image, (image_x, image_y), image)
-        
-        # 转换为base64
-        output_info = processor.output_image(result_image, "border", output_format)
+        
+        def _process():
+            # 加载图片
+            image = processor.load_image(image_source)
+            
+            # 只有带透明度的图片需要转换为RGBA模式
+            has_alpha = _has_alpha(image)
+            if has_alpha and image.mode != "RGBA":
+                image = image.convert("RGBA")
+            
+            # 计算新图片尺寸（考虑阴影偏移和模糊）
+            margin = shadow_blur + max(abs(shadow_offset_x), abs(shadow_offset_y))
+            new_width = image.width + 2 * margin
+            new_height = image.height + 2 * margin
+            
+            # 创建带阴影的新图片
+            result_image = Image.new("RGBA", (new_width, new_height), (0, 0, 0, 0))
+            
+            # 创建阴影
+            shadow_rgb = _hex_to_rgb(shadow_color)
+            shadow_alpha = int(255 * shadow_opacity)
+            
+            if has_alpha:
+                # 阴影颜色处处相同，只有alpha随原图变化：对alpha通道查表（以shadow_alpha为上限）后放入纯色图层
+                shadow_layer = Image.new("RGBA", image.size, shadow_rgb + (0,))
+                shadow_layer.putalpha(image.getchannel("A").point([min(a, shadow_alpha) for a in range(256)]))
+            else:
+                # 完全不透明的图片阴影是均匀的矩形
+                shadow_layer = Image.new("RGBA", image.size, shadow_rgb + (shadow_alpha,))
+            
+            # 应用模糊
+            if shadow_blur > 0:
+                shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(radius=shadow_blur))
+            
+            # 计算阴影位置
+            shadow_x = margin + shadow_offset_x
+            shadow_y = margin + shadow_offset_y
+            
+            # 放置阴影：画布完全透明，直接复制即可
+            result_image.paste(shadow_layer, (shadow_x, shadow_y))
+            
+            # 将原图叠加到阴影上（不透明的图片直接覆盖）
+            image_x = margin
+            image_y = margin
+            if has_alpha:
+                result_image.alpha_composite(image, (image_x, image_y))
+            else:
+                result_image.paste(image, (image_x, image_y))
+            
+            # 转换为base64
+            return image, result_image, processor.output_image(result_image, "border", output_format)
+        
+        # 在线程池中处理，避免阻塞事件循环
+        image, result_image, output_info = await run_in_thread_pool(_process)
         
         return [TextContent(
             type="text",
@@ -657,92 +731,93 @@ async def add_watermark(arguments: Dict[str, Any]) -> List[TextContent]:
         if not watermark_text and not watermark_image:
             raise ValidationError("必须提供watermark_text或watermark_image之一")
         
-        validate_numeric_range(opacity, 0.0, 1.0, "opacity")
-        validate_numeric_range(scale, 0.1, 2.0, "scale")
-        
-        # 加载图片
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 转换为RGBA模式
-        if image.mode != "RGBA":
-            image = image.convert("RGBA")
-        
-        # 创建水印图层
-        watermark_layer = Image.new("RGBA", image.size, (0, 0, 0, 0))
+        _validate_arguments("add_watermark", arguments)
         
-        if watermark_text:
-            # 文字水印
-            from PIL import ImageFont
-            try:
-                # 尝试使用系统字体
+        def _process():
+            # 加载图片
+            image = processor.load_image(image_source)
+            
+            # 转换为RGBA模式
+            if image.mode != "RGBA":
+                image = image.convert("RGBA")
+            
+            # 创建水印图层
+            watermark_layer = Image.new("RGBA", image.size, (0, 0, 0, 0))
+            
+            if watermark_text:
+                # 文字水印
                 font_size = int(min(image.width, image.height) * scale * 0.1)
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                # 使用默认字体
-                font = ImageFont.load_default()
-            
-            draw = ImageDraw.Draw(watermark_layer)
-            
-            # 获取文字尺寸
-            bbox = draw.textbbox((0, 0), watermark_text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            # 计算位置
-            if position == "top-left":
-                x, y = 10, 10
-            elif position == "top-right":
-                x, y = image.width - text_width - 10, 10
-            elif position == "bottom-left":
-                x, y = 10, image.height - text_height - 10
-            elif position == "bottom-right":
-                x, y = image.width - text_width - 10, image.height - text_height - 10
-            else:  # center
-                x, y = (image.width - text_width) // 2, (image.height - text_height) // 2
-            
-            # 绘制文字
-            alpha = int(255 * opacity)
-            draw.text((x, y), watermark_text, font=font, fill=(255, 255, 255, alpha))
-            
-        else:
-            # 图片水印
-            watermark_img = processor.load_image(watermark_image)
-            
-            # 调整水印大小
-            watermark_width = int(image.width * scale)
-            watermark_height = int(watermark_img.height * watermark_width / watermark_img.width)
-            watermark_img = watermark_img.resize((watermark_width, watermark_height), Image.Resampling.LANCZOS)
-            
-            # 转换为RGBA
-            if watermark_img.mode != "RGBA":
-                watermark_img = watermark_img.convert("RGBA")
-            
-            # 调整透明度
-            alpha_channel = watermark_img.split()[-1]
-            alpha_channel = alpha_channel.point(lambda p: int(p * opacity))
-            watermark_img.putalpha(alpha_channel)
-            
-            # 计算位置
-            if position == "top-left":
-                x, y = 10, 10
-            elif position == "top-right":
-                x, y = image.width - watermark_width - 10, 10
-            elif position == "bottom-left":
-                x, y = 10, image.height - watermark_height - 10
-            elif position == "bottom-right":
-                x, y = image.width - watermark_width - 10, image.height - watermark_height - 10
-            else:  # center
-                x, y = (image.width - watermark_width) // 2, (image.height - watermark_height) // 2
-            
-            # 粘贴水印
-            watermark_layer.paste(watermark_img, (x, y), watermark_img)
-        
-        # 合成最终图片
-        result_image = Image.alpha_composite(image, watermark_layer)
-        
-        # 转换为base64
-        output_info = processor.output_image(result_image, "border", output_format)
+                font = _load_font(font_size)
+                
+                draw = ImageDraw.Draw(watermark_layer)
+                
+                # 获取文字尺寸
+                bbox = draw.textbbox((0, 0), watermark_text, font=font)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+                
+                # 计算位置
+                if position == "top-left":
+                    x, y = 10, 10
+                elif position == "top-right":
+                    x, y = image.width - text_width - 10, 10
+                elif position == "bottom-left":
+                    x, y = 10, image.height - text_height - 10
+                elif position == "bottom-right":
+                    x, y = image.width - text_width - 10, image.height - text_height - 10
+                else:  # center
+                    x, y = (image.width - text_width) // 2, (image.height - text_height) // 2
+                
+                # 绘制文字
+                alpha = int(255 * opacity)
+                draw.text((x, y), watermark_text, font=font, fill=(255, 255, 255, alpha))
+                
+            else:
+                # 图片水印
+                watermark_img = processor.load_image(watermark_image)
+                
+                # 调整水印大小
+                watermark_width = int(image.width * scale)
+                watermark_height = int(watermark_img.height * watermark_width / watermark_img.width)
+                # 缩小到一半以下时叠加层上看不出差别，改用更快的双线性插值
+                if watermark_width > watermark_img.width * 0.5:
+                    resample = Image.Resampling.LANCZOS
+                else:
+                    resample = Image.Resampling.BILINEAR
+                watermark_img = watermark_img.resize((watermark_width, watermark_height), resample)
+                
+                # 转换为RGBA
+                if watermark_img.mode != "RGBA":
+                    watermark_img = watermark_img.convert("RGBA")
+                
+                # 调整透明度
+                alpha_channel = watermark_img.getchannel("A")
+                alpha_channel = alpha_channel.point(_opacity_table(float(opacity)))
+                watermark_img.putalpha(alpha_channel)
+                
+                # 计算位置
+                if position == "top-left":
+                    x, y = 10, 10
+                elif position == "top-right":
+                    x, y = image.width - watermark_width - 10, 10
+                elif position == "bottom-left":
+                    x, y = 10, image.height - watermark_height - 10
+                elif position == "bottom-right":
+                    x, y = image.width - watermark_width - 10, image.height - watermark_height - 10
+                else:  # center
+                    x, y = (image.width - watermark_width) // 2, (image.height - watermark_height) // 2
+                
+                # 粘贴水印
+                watermark_layer.paste(watermark_img, (x, y), watermark_img)
+            
+            # 合成最终图片
+            result_image = Image.alpha_composite(image, watermark_layer)
+            
+            # 转换为base64
+            return image, processor.output_image(result_image, "border", output_format)
+        
+        # 在线程池中处理，避免阻塞事件循环
+        image, output_info = await run_in_thread_pool(_process)
         
         return [TextContent(
             type="text",
@@ -801,59 +876,53 @@ async def apply_vignette(arguments: Dict[str, Any]) -> List[TextContent]:
         output_format = arguments.get("output_format", DEFAULT_IMAGE_FORMAT)
         
         # 验证参数
-        validate_numeric_range(intensity, 0.0, 1.0, "intensity")
-        validate_numeric_range(radius, 0.0, 1.0, "radius")
+        _validate_arguments("apply_vignette", arguments)
         validate_color_hex(color)
         
-        # 加载图片
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 转换为RGBA模式
-        if image.mode != "RGBA":
-            image = image.convert("RGBA")
-        
-        # 创建暗角遮罩
-        mask = Image.new("L", image.size, 255)
-        draw = ImageDraw.Draw(mask)
-        
-        # 计算中心点和半径
-        center_x, center_y = image.width // 2, image.height // 2
-        max_radius = min(image.width, image.height) // 2
-        vignette_radius = int(max_radius * radius)
-        
-        # 创建径向渐变
-        for y in range(image.height):
-            for x in range(image.width):
-                # 计算到中心的距离
-                distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                
-                # 计算暗角强度
-                if distance <= vignette_radius:
-                    alpha = 255
-                else:
-                    # 在半径外应用渐变
-                    fade_distance = distance - vignette_radius
-                    fade_ratio = min(fade_distance / (max_radius - vignette_radius), 1.0)
-                    alpha = int(255 * (1 - intensity * fade_ratio))
-                
-                mask.putpixel((x, y), alpha)
-        
-        # 应用高斯模糊使暗角更自然
-        mask = mask.filter(ImageFilter.GaussianBlur(radius=max_radius * 0.1))
-        
-        # 创建暗角图层
-        vignette_rgb = tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
-        vignette_layer = Image.new("RGBA", image.size, vignette_rgb + (0,))
-        
-        # 应用遮罩
-        vignette_layer.putalpha(mask)
-        
-        # 合成图片
-        result_image = Image.alpha_composite(image, vignette_layer)
+        def _process():
+            # 加载图片
+            image = processor.load_image(image_source)
+            
+            # 转换为RGBA模式
+            if image.mode != "RGBA":
+                image = image.convert("RGBA")
+            
+            # 计算中心点和半径
+            center_x, center_y = image.width // 2, image.height // 2
+            max_radius = min(image.width, image.height) // 2
+            vignette_radius = int(max_radius * radius)
+            
+            # 按整数半径预先计算径向渐变表：半径内保持完全不透明，半径外线性渐变
+            # （渐变带宽度为0时半径外直接取最大强度）
+            fade_width = max_radius - vignette_radius
+            radii = np.arange(max_radius + 1)
+            fade_ratio = np.minimum((radii - vignette_radius) / max(fade_width, 1), 1.0)
+            ramp = np.where(radii <= vignette_radius, 255, 255 * (1 - intensity * fade_ratio)).astype(np.uint8)
+            
+            # 计算每个像素到中心的距离，超出max_radius的按max_radius处理，再查表得到暗角遮罩
+            # 渐变本身连续平滑，无需再做整图高斯模糊
+            # 平方项按行列分别计算后广播相加，整图只分配一个float32距离缓冲区并原地计算
+            dx2 = ((np.arange(image.width) - center_x) ** 2).astype(np.float32)
+            dy2 = ((np.arange(image.height) - center_y) ** 2).astype(np.float32)
+            distance = dy2[:, np.newaxis] + dx2
+            np.sqrt(distance, out=distance)
+            np.minimum(distance, max_radius, out=distance)
+            mask = ramp.take(distance.astype(np.uint16))[..., np.newaxis].astype(np.uint16)
+            
+            # 一次混合完成合成：遮罩为原图权重，其余部分混入暗角颜色，alpha通道保持不变
+            vignette_rgb = np.array(_hex_to_rgb(color), dtype=np.uint16)
+            pixels = np.asarray(image)
+            blended = pixels[..., :3] * mask + vignette_rgb * (255 - mask) + 127
+            blended //= 255
+            result_pixels = pixels.copy()
+            result_pixels[..., :3] = blended
+            result_image = Image.fromarray(result_pixels, "RGBA")
+            
+            # 转换为base64
+            return image, processor.output_image(result_image, "border", output_format)
         
-        # 转换为base64
-        output_info = processor.output_image(result_image, "border", output_format)
+        # 在线程池中处理，避免阻塞事件循环
+        image, output_info = await run_in_thread_pool(_process)
         
         return [TextContent(
             type="text",
@@ -912,62 +981,62 @@ async def create_polaroid(arguments: Dict[str, Any]) -> List[TextContent]:
         output_format = arguments.get("output_format", DEFAULT_IMAGE_FORMAT)
         
         # 验证参数
-        validate_numeric_range(border_width, 10, 100, "border_width")
-        validate_numeric_range(bottom_border, 20, 200, "bottom_border")
+        _validate_arguments("create_polaroid", arguments)
         validate_color_hex(border_color)
-        validate_numeric_range(rotation, -15, 15, "rotation")
-        
-        # 加载图片
-        processor = ImageProcessor()
-        image = processor.load_image(image_source)
-        
-        # 创建宝丽来边框
-        polaroid_width = image.width + 2 * border_width
-        polaroid_height = image.height + border_width + bottom_border
-        
-        # 创建白色背景
-        border_rgb = tuple(int(border_color[i:i+2], 16) for i in (1, 3, 5))
-        polaroid = Image.new("RGB", (polaroid_width, polaroid_height), border_rgb)
-        
-        # 粘贴原图片
-        polaroid.paste(image, (border_width, border_width))
-        
-        # 应用旋转
-        if rotation != 0:
-            # 扩展画布以容纳旋转后的图片
-            diagonal = int(((polaroid_width ** 2 + polaroid_height ** 2) ** 0.5))
-            expanded = Image.new("RGBA", (diagonal, diagonal), (0, 0, 0, 0))
-            
-            # 将宝丽来图片粘贴到扩展画布的中心
-            offset_x = (diagonal - polaroid_width) // 2
-            offset_y = (diagonal - polaroid_height) // 2
-            expanded.paste(polaroid, (offset_x, offset_y))
-            
-            # 旋转
-            rotated = expanded.rotate(rotation, expand=True, fillcolor=(0, 0, 0, 0))
-            
-            # 裁剪到合适大小
-            bbox = rotated.getbbox()
-            if bbox:
-                polaroid = rotated.crop(bbox)
-        
-        # 添加轻微的阴影效果
-        shadow_offset = 5
-        shadow_size = (polaroid.width + shadow_offset * 2, polaroid.height + shadow_offset * 2)
-        final_image = Image.new("RGBA", shadow_size, (0, 0, 0, 0))
-        
-        # 创建阴影
-        shadow = Image.new("RGBA", polaroid.size, (128, 128, 128, 100))
-        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=3))
-        final_image.paste(shadow, (shadow_offset, shadow_offset), shadow)
-        
-        # 粘贴宝丽来图片
-        if polaroid.mode != "RGBA":
-            polaroid = polaroid.convert("RGBA")
-        final_image.paste(polaroid, (0, 0), polaroid)
-        
-        # 转换为base64
-        output_info = processor.output_image(final_image, "border", output_format)
+        
+        def _process():
+            # 加载图片
+            image = processor.load_image(image_source)
+            
+            # 创建宝丽来边框
+            polaroid_width = image.width + 2 * border_width
+            polaroid_height = image.height + border_width + bottom_border
+            
+            # 创建白色背景
+            border_rgb = _hex_to_rgb(border_color)
+            polaroid = Image.new("RGB", (polaroid_width, polaroid_height), border_rgb)
+            
+            # 粘贴原图片
+            polaroid.paste(image, (border_width, border_width))
+            
+            # 应用旋转
+            if rotation != 0:
+                # 扩展画布以容纳旋转后的图片
+                diagonal = int(((polaroid_width ** 2 + polaroid_height ** 2) ** 0.5))
+                expanded = Image.new("RGBA", (diagonal, diagonal), (0, 0, 0, 0))
+                
+                # 将宝丽来图片粘贴到扩展画布的中心
+                offset_x = (diagonal - polaroid_width) // 2
+                offset_y = (diagonal - polaroid_height) // 2
+                expanded.paste(polaroid, (offset_x, offset_y))
+                
+                # 旋转
+                rotated = expanded.rotate(rotation, expand=True, fillcolor=(0, 0, 0, 0))
+                
+                # 裁剪到合适大小
+                bbox = rotated.getbbox()
+                if bbox:
+                    polaroid = rotated.crop(bbox)
+            
+            # 添加轻微的阴影效果
+            shadow_offset = 5
+            shadow_size = (polaroid.width + shadow_offset * 2, polaroid.height + shadow_offset * 2)
+            final_image = Image.new("RGBA", shadow_size, (0, 0, 0, 0))
+            
+            # 创建阴影（纯色图层高斯模糊后像素不变，直接使用纯色图层）
+            shadow = Image.new("RGBA", polaroid.size, (128, 128, 128, 100))
+            final_image.paste(shadow, (shadow_offset, shadow_offset), shadow)
+            
+            # 粘贴宝丽来图片
+            if polaroid.mode != "RGBA":
+                polaroid = polaroid.convert("RGBA")
+            final_image.paste(polaroid, (0, 0), polaroid)
+            
+            # 转换为base64
+            return image, final_image, processor.output_image(final_image, "border", output_format)
+        
+        # 在线程池中处理，避免阻塞事件循环
+        image, final_image, output_info = await run_in_thread_pool(_process)
         
         return [TextContent(
             type="text",
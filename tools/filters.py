@@ -14,6 +14,16 @@ import json
 # 全局图片处理器实例
 processor = ImageProcessor()
 
+# 棕褐色变换矩阵（Image.convert使用的3x4格式，每行对应输出的R、G、B）
+_SEPIA_MATRIX = (
+    0.393, 0.769, 0.189, 0,
+    0.349, 0.686, 0.168, 0,
+    0.272, 0.534, 0.131, 0
+)
+
+# RGBA反色查找表：颜色通道取反，alpha通道保持不变
+_INVERT_RGBA_TABLE = list(range(255, -1, -1)) * 3 + list(range(256))
+
 def get_filter_tools() -> list[Tool]:
     """
     获取滤镜效果工具列表
@@ -608,25 +618,8 @@ async def apply_sepia(image_data: str) -> list[TextContent]:
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
-        # 应用棕褐色滤镜
-        pixels = image.load()
-        width, height = image.size
-        
-        for y in range(height):
-            for x in range(width):
-                r, g, b = pixels[x, y]
-                
-                # 棕褐色变换公式
-                tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                
-                # 确保值在0-255范围内
-                tr = min(255, tr)
-                tg = min(255, tg)
-                tb = min(255, tb)
-                
-                pixels[x, y] = (tr, tg, tb)
+        # 应用棕褐色滤镜：颜色矩阵变换在C层完成，结果自动限制在0-255范围内
+        image = image.convert('RGB', _SEPIA_MATRIX)
         
         # 输出处理后的图片
         output_info = processor.output_image(image, "sepia")
@@ -675,8 +668,13 @@ async def apply_invert(image_data: str) -> list[TextContent]:
         # 加载图片
         image = processor.load_image(image_data)
         
-        # 应用反色滤镜
-        inverted_image = ImageOps.invert(image.convert('RGB'))
+        # 应用反色滤镜：RGB直接反色，RGBA保留透明度，其余模式先转换为RGB
+        if image.mode == 'RGB':
+            inverted_image = ImageOps.invert(image)
+        elif image.mode == 'RGBA':
+            inverted_image = image.point(_INVERT_RGBA_TABLE)
+        else:
+            inverted_image = ImageOps.invert(image.convert('RGB'))
         
         # 输出处理后的图片
         output_info = processor.output_image(inverted_image, "invert")
@@ -3,13 +3,29 @@
 提供图片加载、保存、格式转换等基础功能
 """
 
-from PIL import Image
+from PIL import Image, ImageOps
+import numpy as np
 import base64
+import hashlib
 import io
 import os
+import threading
 import uuid
+from collections import OrderedDict
 from typing import Union, Tuple, Optional
-from config import OUTPUT_MODE, TEMP_DIR, USE_OPERATION_PREFIX
+from config import (
+    OUTPUT_MODE, TEMP_DIR, USE_OPERATION_PREFIX,
+    ENABLE_CACHE, DECODE_CACHE_SIZE, DECODE_CACHE_MAX_BYTES, DECODE_CACHE_TOTAL_BYTES
+)
+
+# 解码缓存（所有实例共享）：键为文件路径+修改时间或base64内容哈希，值为已解码的图片
+_decode_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_decode_cache_lock = threading.Lock()
+_decode_cache_bytes = 0  # 缓存中图片的像素字节总数，受_decode_cache_lock保护
+
+def _image_nbytes(image: Image.Image) -> int:
+    """估算图片解码后的像素字节数"""
+    return image.width * image.height * len(image.getbands())
 
 class ImageProcessor:
     """核心图片处理类"""
@@ -22,12 +38,14 @@ class ImageProcessor:
         if not os.path.exists(TEMP_DIR):
             os.makedirs(TEMP_DIR, exist_ok=True)
     
-    def load_image(self, source: Union[str, bytes]) -> Image.Image:
+    def load_image(self, source: Union[str, bytes],
+                   draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
         """
         加载图片，支持文件路径、base64编码
         
         Args:
             source: 图片源，可以是文件路径或base64编码字符串
+            draft_size: 可选的目标尺寸，JPEG图片会在解码时按1/2、1/4、1/8缩小到不小于该尺寸
             
         Returns:
             PIL Image对象
@@ -40,7 +58,7 @@ class ImageProcessor:
             if isinstance(source, str):
                 if source.startswith('data:image'):
                     # base64编码的图片
-                    header, data = source.split(',', 1)
+                    _, _, data = source.partition(',')
                     image_data = base64.b64decode(data)
                     image = Image.open(io.BytesIO(image_data))
                 else:
@@ -57,11 +75,122 @@ class ImageProcessor:
             if image.size[0] > self.max_image_size[0] or image.size[1] > self.max_image_size[1]:
                 raise ValueError(f"图片尺寸过大，最大支持: {self.max_image_size}")
             
+            # 读取EXIF方向信息（仅在图片带有EXIF块时读取，避免提前解码）
+            orientation = 1
+            if "exif" in image.info:
+                orientation = image.getexif().get(0x0112, 1)
+            
+            if draft_size is not None:
+                if orientation in (5, 6, 7, 8):
+                    # 旋转90°的图片按旋转前的宽高计算解码尺寸
+                    draft_size = (draft_size[1], draft_size[0])
+                image.draft(None, draft_size)
+            
+            # 按EXIF方向旋转图片，并移除已失效的方向标签
+            if orientation in (2, 3, 4, 5, 6, 7, 8):
+                image_format = image.format
+                image = ImageOps.exif_transpose(image)
+                image.format = image_format
+            
             return image
             
         except Exception as e:
             raise IOError(f"图片加载失败: {str(e)}")
     
+    def load_image_cached(self, source: Union[str, bytes],
+                          draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        加载图片并缓存解码结果，重复的图片源直接返回缓存图片的副本
+        
+        Args:
+            source: 图片源，可以是文件路径或base64编码字符串
+            draft_size: 可选的目标尺寸，参见 load_image
+            
+        Returns:
+            PIL Image对象（可自由修改的副本）
+        """
+        global _decode_cache_bytes
+        
+        key = self._decode_cache_key(source) if ENABLE_CACHE else None
+        if key is None:
+            return self.load_image(source, draft_size)
+        key += (draft_size,)
+        
+        with _decode_cache_lock:
+            cached = _decode_cache.get(key)
+            if cached is not None:
+                _decode_cache.move_to_end(key)
+        
+        if cached is None:
+            image = self.load_image(source, draft_size)
+            image.load()
+            # 超大图片不进入缓存，避免占用过多内存
+            nbytes = _image_nbytes(image)
+            if nbytes > min(DECODE_CACHE_MAX_BYTES, DECODE_CACHE_TOTAL_BYTES):
+                return image
+            
+            cached = image
+            with _decode_cache_lock:
+                # 其他线程可能已缓存了同一图片，替换时先扣除旧条目的字节数
+                previous = _decode_cache.pop(key, None)
+                if previous is not None:
+                    _decode_cache_bytes -= _image_nbytes(previous)
+                _decode_cache[key] = cached
+                _decode_cache_bytes += nbytes
+                
+                # 按图片数和像素字节总数两个上限淘汰最久未用的图片
+                while (len(_decode_cache) > DECODE_CACHE_SIZE
+                       or _decode_cache_bytes > DECODE_CACHE_TOTAL_BYTES):
+                    _, evicted = _decode_cache.popitem(last=False)
+                    _decode_cache_bytes -= _image_nbytes(evicted)
+        
+        # 返回副本，调用方的原地修改（如thumbnail）不会影响缓存
+        image = cached.copy()
+        image.format = cached.format
+        return image
+    
+    def load_as_array(self, source: Union[str, bytes],
+                      modes: Optional[Tuple[str, ...]] = None) -> Tuple[np.ndarray, str]:
+        """
+        加载图片并返回像素数组，供numpy/OpenCV直接处理
+        
+        Args:
+            source: 图片源，可以是文件路径或base64编码字符串
+            modes: 可接受的图片模式，图片模式不在其中时转换为第一个模式
+            
+        Returns:
+            (像素数组, 原始图片模式)，数组形状为(H, W)或(H, W, C)
+        """
+        image = self.load_image_cached(source)
+        original_mode = image.mode
+        if modes and image.mode not in modes:
+            image = image.convert(modes[0])
+        return np.asarray(image), original_mode
+    
+    @staticmethod
+    def _decode_cache_key(source: Union[str, bytes]) -> Optional[tuple]:
+        """
+        计算解码缓存键，无法缓存时返回None
+        
+        Args:
+            source: 图片源
+            
+        Returns:
+            缓存键或None
+        """
+        if not isinstance(source, str):
+            return None
+        
+        if source.startswith('data:image'):
+            digest = hashlib.blake2b(source.encode(), digest_size=16).digest()
+            return ('base64', digest)
+        
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        return ('file', os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+    
     def save_image(self, image: Image.Image, output_path: str, 
                    format: str = 'PNG', quality: int = 95) -> str:
         """
@@ -87,7 +216,12 @@ class ImageProcessor:
                     background = Image.new('RGB', image.size, (255, 255, 255))
                     background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
                     image = background
-                image.save(output_path, format=format, quality=quality)
+                # 已指定质量，关闭额外的Huffman优化和渐进式编码以减少编码耗时
+                image.save(output_path, format=format, quality=quality,
+                           optimize=False, progressive=False)
+            elif format.upper() == 'WEBP':
+                # method=4 在压缩率和编码速度之间折中（6最慢）
+                image.save(output_path, format=format, quality=quality, method=4)
             else:
                 image.save(output_path, format=format)
             
@@ -120,7 +254,9 @@ class ImageProcessor:
             else:
                 image.save(buffer, format=format)
             
-            img_str = base64.b64encode(buffer.getvalue()).decode()
+            # 直接对缓冲区视图编码，避免getvalue()再复制一份编码后的图片数据
+            with buffer.getbuffer() as encoded:
+                img_str = base64.b64encode(encoded).decode()
             return f"data:image/{format.lower()};base64,{img_str}"
             
         except Exception as e:
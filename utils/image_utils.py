@@ -73,7 +73,9 @@ def base64_to_image(base64_data: str) -> Image.Image:
         PIL图片对象
     """
     if base64_data.startswith('data:image/'):
-        base64_data = base64_data.split(',')[1]
+        # partition 单次扫描且不生成列表，适合数MB的base64字符串
+        _, sep, tail = base64_data.partition(',')
+        base64_data = tail if sep else base64_data
     
     image_data = base64.b64decode(base64_data)
     return Image.open(io.BytesIO(image_data))
@@ -10,7 +10,7 @@ import os
 import gc
 import psutil
 from typing import Dict, Any, Optional, Callable, List
-from functools import wraps
+from functools import wraps, partial
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import asyncio
 from PIL import Image
@@ -218,6 +218,26 @@ performance_monitor = PerformanceMonitor()
 image_cache = ImageCache()
 resource_manager = ResourceManager()
 
+# 共享线程池：同步的图片处理操作在此执行，跨请求复用线程
+_thread_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASKS, thread_name_prefix="image-worker")
+
+async def run_in_thread_pool(func: Callable, *args, **kwargs):
+    """
+    在共享线程池中执行同步函数，避免阻塞事件循环
+    
+    注意：不要在线程池任务内部同步等待另一个线程池任务，以免线程耗尽导致死锁。
+    
+    Args:
+        func: 同步函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+        
+    Returns:
+        函数返回值
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_thread_pool, partial(func, *args, **kwargs))
+
 def performance_tracking(operation_name: str):
     """性能跟踪装饰器"""
     def decorator(func: Callable):
@@ -372,6 +392,7 @@ __all__ = [
     "BatchProcessor",
     "performance_tracking",
     "process_with_timeout",
+    "run_in_thread_pool",
     "optimize_image_for_processing",
     "get_performance_stats",
     "reset_performance_stats",
@@ -0,0 +1,28 @@
+"""
+JSON序列化工具模块
+
+工具响应统一在此序列化。安装了可选依赖 orjson 时使用其原生编码器，
+否则回退到标准库 json，两者输出的都是保留非ASCII字符的JSON文本。
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_json(data: Any) -> str:
+    """
+    将数据序列化为JSON字符串
+    
+    Args:
+        data: 可JSON序列化的数据
+        
+    Returns:
+        JSON字符串（非ASCII字符不转义）
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False)
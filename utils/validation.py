@@ -6,8 +6,12 @@
 import re
 import os
 import base64
+from functools import lru_cache
 from typing import Union, Tuple, Any
 
+# 支持 #RGB, #RRGGBB, #RRGGBBAA 格式
+_COLOR_HEX_PATTERN = re.compile(r'^#([A-Fa-f0-9]{3}|[A-Fa-f0-9]{6}|[A-Fa-f0-9]{8})$')
+
 def validate_image_source(source: str) -> bool:
     """
     验证图片源是否有效
@@ -71,9 +75,12 @@ def validate_color_hex(color: str) -> bool:
     if not isinstance(color, str):
         return False
     
-    # 支持 #RGB, #RRGGBB, #RRGGBBAA 格式
-    pattern = r'^#([A-Fa-f0-9]{3}|[A-Fa-f0-9]{6}|[A-Fa-f0-9]{8})$'
-    return bool(re.match(pattern, color))
+    return _match_color_hex(color)
+
+@lru_cache(maxsize=64)
+def _match_color_hex(color: str) -> bool:
+    """匹配十六进制颜色格式（结果缓存，同一颜色只解析一次）"""
+    return bool(_COLOR_HEX_PATTERN.match(color))
 
 def validate_image_dimensions(width: int, height: int, max_size: Tuple[int, int] = (4096, 4096)) -> bool:
     """